@@ -195,6 +195,9 @@ class ToursApp:
             self.auth_controller.logout()
             self.current_user = None
             
+            # Descartar el formulario de registro construido para esta sesión
+            self.register_view.dispose()
+            
             # Volver al login
             self.show_login()
             logger.info("Logout completado")
@@ -373,8 +376,8 @@ class ToursApp:
                 logger.warning(f"No se pudieron cargar paradas: {resultado['message']}")
             
             # Crear y mostrar la vista de paradas
-            content = self.paradas_view.create(user=self.current_user, ruta=ruta, paradas=paradas)
             self.paradas_view.set_page_reference(self.page)
+            content = self.paradas_view.create(user=self.current_user, ruta=ruta, paradas=paradas)
             self._clear_and_show(content)
             
             # Mostrar mensaje si hubo error al cargar
@@ -790,8 +793,8 @@ class ToursApp:
             ruta = self.ruta_graph_view.ruta
             resultado = self.paradas_controller.get_route_stops(ruta.id, self.current_user.id)
             paradas = resultado["paradas"] if resultado["success"] else []
-            content = self.paradas_view.create(user=self.current_user, ruta=ruta, paradas=paradas)
             self.paradas_view.set_page_reference(self.page)
+            content = self.paradas_view.create(user=self.current_user, ruta=ruta, paradas=paradas)
             self._clear_and_show(content)
             return
         # Si no, asumimos que estamos en la vista de conexiones
@@ -800,8 +803,8 @@ class ToursApp:
         if parada and ruta:
             resultado = self.paradas_controller.get_route_stops(ruta.id, self.current_user.id)
             paradas = resultado["paradas"] if resultado["success"] else []
-            content = self.paradas_view.create(user=self.current_user, ruta=ruta, paradas=paradas)
             self.paradas_view.set_page_reference(self.page)
+            content = self.paradas_view.create(user=self.current_user, ruta=ruta, paradas=paradas)
             self._clear_and_show(content)
         else:
             self.show_dashboard()
@@ -34,7 +34,9 @@ class AppConfig:
         "success_color": "green",
         "error_color": "red",
         "warning_color": "orange",
-        "info_color": "grey"
+        "info_color": "grey",
+        # Espera tras la última pulsación antes de limpiar el mensaje de estado
+        "status_clear_debounce": 0.3  # segundos
     }
     
     # Configuración de campos
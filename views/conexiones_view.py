@@ -2,16 +2,71 @@
 Vista de Conexiones
 Maneja la interfaz de usuario para mostrar y gestionar conexiones entre paradas
 """
+import asyncio
+import logging
+from functools import partial
 import flet as ft
 from typing import Callable, Optional, List
 from models import User, Ruta, Parada, Conexion
 
+logger = logging.getLogger(__name__)
+
+# Estilos de los mensajes según su tipo: (color, bgcolor, emoji)
+_STYLE_BY_TYPE = {
+    "info": ("blue", "lightblue100", "ℹ️"),
+    "success": ("green", "lightgreen100", ""),
+    "warning": ("orange", "lightyellow100", "⚠️"),
+    "error": ("red", "lightred100", "❌")
+}
+_VALID_MSG_TYPES = frozenset(_STYLE_BY_TYPE)
+
+# Segundos que permanece visible un mensaje de éxito
+_AUTO_HIDE_SECONDS = 2
+
+
+def _build_empty_state() -> ft.Container:
+    """
+    Construye el contenido mostrado cuando la parada no tiene conexiones
+    
+    Returns:
+        Container con el mensaje de estado vacío
+    """
+    return ft.Container(
+        content=ft.Column([
+            ft.Text("🔗", size=80),
+            ft.Text("No hay conexiones desde esta parada", size=18, weight=ft.FontWeight.BOLD, color="grey"),
+            ft.Text("¡Crea la primera conexión para comenzar!", size=14, color="grey"),
+            ft.Container(height=15),
+            ft.Text("💡 Las conexiones definen cómo se puede", size=12, color="grey"),
+            ft.Text("navegar entre paradas de tu ruta", size=12, color="grey"),
+        ], 
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=8),
+        padding=30,
+        border_radius=10,
+        bgcolor="grey50",
+        border=ft.border.all(1, "grey300"),
+        alignment=ft.alignment.center
+    )
+
 
 class ConexionesView:
     """
     Vista para gestionar conexiones entre paradas
     """
     
+    __slots__ = (
+        "on_back", "on_create_connection", "on_delete_connection", "on_update_connection",
+        "user", "ruta", "parada", "conexiones", "paradas_disponibles", "_connected_ids_cache",
+        "message_container", "connections_container", "_count_text", "_cards_column",
+        "_connections_list_content", "_empty_state_container", "_last_conexiones_sig",
+        "_create_dlg", "_create_dropdown", "_create_distancia_field", "_create_error_container",
+        "_create_origen_text", "_edit_dlg", "_edit_dropdown", "_edit_distancia_field",
+        "_edit_error_container", "_edit_origen_text", "_edit_destino_text", "_editing_parada_actual_id",
+        "_delete_dlg", "_delete_descripcion_text", "_delete_distancia_text", "_deleting_conexion",
+        "_no_destinations_dlg", "_page_ref", "_update_pending", "_hide_task",
+    )
+    
     def __init__(self, on_back: Callable, on_create_connection: Callable, on_delete_connection: Callable = None, on_update_connection: Callable = None):
         """
         Inicializa la vista de conexiones
@@ -31,11 +86,30 @@ class ConexionesView:
         self.parada = None
         self.conexiones = []
         self.paradas_disponibles = []
+        self._connected_ids_cache = None
         self.message_container = None
         self.connections_container = None
+        self._count_text = None
+        self._cards_column = None
+        self._connections_list_content = None
+        self._empty_state_container = None
+        self._last_conexiones_sig = None
+        # Diálogos reutilizables (se construyen en la primera apertura)
+        self._create_dlg = None
+        self._edit_dlg = None
+        self._delete_dlg = None
+        self._no_destinations_dlg = None
+        self._editing_parada_actual_id = None
+        self._deleting_conexion = None
         self._page_ref = None
-        self.page = None  # Referencia a la página (será igual a _page_ref)
+        self._update_pending = False
+        self._hide_task = None
         
+    @property
+    def page(self) -> Optional[ft.Page]:
+        """Referencia a la página (única fuente: _page_ref)"""
+        return self._page_ref
+    
     def create(self, user: Optional[User] = None, ruta: Optional[Ruta] = None, 
                parada: Optional[Parada] = None, conexiones: List[Conexion] = None,
                paradas_disponibles: List[dict] = None, page: Optional[ft.Page] = None) -> ft.Container:
@@ -62,6 +136,7 @@ class ConexionesView:
         self.ruta = ruta
         self.parada = parada
         self.conexiones = conexiones or []
+        self._connected_ids_cache = None
         self.paradas_disponibles = paradas_disponibles or []
         
         # Información de la parada
@@ -72,6 +147,17 @@ class ConexionesView:
         self.message_container = ft.Container()
         self.connections_container = ft.Container()
         
+        # Lista persistente: solo cambian el contador y las tarjetas
+        self._count_text = ft.Text("", size=14, weight=ft.FontWeight.BOLD, color="grey")
+        self._cards_column = ft.Column([], spacing=10)
+        self._connections_list_content = ft.Column([
+            self._count_text,
+            ft.Container(height=10),
+            self._cards_column
+        ], 
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=5)
+        
         # Actualizar contenido de conexiones
         self._update_connections_content()
         
@@ -118,8 +204,7 @@ class ConexionesView:
                             on_click=self._on_create_connection_click,
                             bgcolor="green",
                             color="white",
-                            height=40,
-                            data=self.page if hasattr(self, "page") else None  # Almacenar referencia a la página si existe
+                            height=40
                         ),
                     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                     padding=ft.padding.symmetric(horizontal=10)
@@ -152,16 +237,16 @@ class ConexionesView:
     
     def _on_create_connection_click(self, e):
         """Maneja el click del botón crear conexión"""
-        print("DEBUG: Botón 'Nueva Conexión' clicado")
+        logger.debug("Botón 'Nueva Conexión' clicado")
         
         # Si la página no está establecida pero podemos obtenerla del evento
         if not self._page_ref and e and hasattr(e, "page") and e.page:
-            print("DEBUG: Estableciendo referencia a la página desde el evento del botón")
+            logger.debug("Estableciendo referencia a la página desde el evento del botón")
             self.set_page_reference(e.page)
             
         # Si no tenemos la referencia, buscar desde el control
         if not self._page_ref and e and hasattr(e, "control") and hasattr(e.control, "page") and e.control.page:
-            print("DEBUG: Estableciendo referencia a la página desde el control del botón")
+            logger.debug("Estableciendo referencia a la página desde el control del botón")
             self.set_page_reference(e.control.page)
             
         self._open_create_connection_form()
@@ -171,47 +256,53 @@ class ConexionesView:
         
         # Verificar si tenemos referencia a la página
         if not self._page_ref:
-            print("ERROR: No hay referencia a la página (self._page_ref es None)")
+            logger.error("No hay referencia a la página (self._page_ref es None)")
             return
         
-        # Filtrar paradas disponibles usando la función auxiliar
+        # Filtrar paradas para mostrar solo destinos válidos (sin la parada actual y sin las ya conectadas)
         filtered_paradas = self._filter_valid_destinations(self.paradas_disponibles)
         
         if not filtered_paradas:
             # Mostrar mensaje si no hay paradas disponibles después del filtrado
-            dlg = ft.AlertDialog(
-                modal=True,
-                title=ft.Text("⚠️ Sin paradas disponibles"),
-                content=ft.Text("No hay paradas disponibles para crear conexiones. Todas las paradas de esta ruta ya están conectadas o no son válidas como destino.", size=14),
-                actions=[
-                    ft.TextButton("Entendido", on_click=lambda e: self._close_dialog(dlg)),
-                ],
-            )
-            self._page_ref.open(dlg)
+            if self._no_destinations_dlg is None:
+                self._no_destinations_dlg = ft.AlertDialog(
+                    modal=True,
+                    title=ft.Text("⚠️ Sin paradas disponibles"),
+                    content=ft.Text("No hay paradas disponibles para crear conexiones. Todas las paradas de esta ruta ya están conectadas o no son válidas como destino.", size=14),
+                    actions=[
+                        ft.TextButton("Entendido", on_click=lambda e: self._close_dialog(self._no_destinations_dlg)),
+                    ],
+                )
+            self._page_ref.open(self._no_destinations_dlg)
             return
         
-        # Filtrar paradas para mostrar solo destinos válidos (sin la parada actual y sin las ya conectadas)
-        filtered_paradas = self._filter_valid_destinations(self.paradas_disponibles)
-        
+        # El diálogo se construye una sola vez y se reinicia en cada apertura
+        if self._create_dlg is None:
+            self._build_create_dialog()
+        
+        # Solo las opciones dependen de las paradas disponibles
+        self._create_dropdown.options = [
+            ft.dropdown.Option(key=str(parada_data["id"]), text=parada_data["nombre"])
+            for parada_data in filtered_paradas
+        ]
+        self._create_dropdown.value = None
+        self._create_distancia_field.value = ""
+        self._create_error_container.content = None
+        self._create_origen_text.value = f"Desde: {self.parada.nombre}"
+        
+        self._page_ref.open(self._create_dlg)
+    
+    def _build_create_dialog(self):
+        """Construye el diálogo reutilizable para crear conexiones"""
         # Crear selector de parada destino
-        parada_options = []
-        for parada_data in filtered_paradas:
-            parada_options.append(
-                ft.dropdown.Option(
-                    key=str(parada_data["id"]),
-                    text=parada_data["nombre"]
-                )
-            )
-        
-        parada_dropdown = ft.Dropdown(
+        self._create_dropdown = ft.Dropdown(
             label="Parada destino",
             hint_text="Selecciona una parada",
-            options=parada_options,
             width=300
         )
         
         # Campo de distancia
-        distancia_field = ft.TextField(
+        self._create_distancia_field = ft.TextField(
             label="Distancia (km)", 
             hint_text="Ej: 2.5",
             width=300,
@@ -219,138 +310,146 @@ class ConexionesView:
         )
         
         # Contenedor para mensajes de error
-        error_container = ft.Container()
-        
-        def show_error(message):
-            """Muestra un mensaje de error en el formulario"""
-            error_container.content = ft.Container(
-                content=ft.Text(
-                    message, 
-                    color="red", 
-                    size=12,
-                    text_align=ft.TextAlign.CENTER
-                ),
-                padding=5,
-                border_radius=5,
-                bgcolor="red100",
-                border=ft.border.all(1, "red")
-            )
-            self._page_ref.update()
-        
-        def clear_error():
-            """Limpia el mensaje de error"""
-            error_container.content = None
-            self._page_ref.update()
-        
-        def handle_close(e):
-            if e.control.text == "Crear Conexión":
-                # Limpiar errores previos
-                clear_error()
-                
-                # Validar parada destino
-                if not parada_dropdown.value:
-                    show_error("❌ Debes seleccionar una parada destino")
-                    return
-                
-                # Validar que la parada destino no sea la misma que la parada origen
-                parada_destino_id = int(parada_dropdown.value)
-                if parada_destino_id == self.parada.id:
-                    show_error("❌ Error: No puedes conectar una parada consigo misma")
-                    return
-                    
-                # Verificar si ya existe una conexión con este destino
-                for conexion in self.conexiones:
-                    if (conexion.parada_origen_id == self.parada.id and 
-                        conexion.parada_destino_id == parada_destino_id):
-                        show_error("❌ Error: Ya existe una conexión con esta parada")
-                        return
-                
-                # Validar distancia
-                distancia_str = distancia_field.value
-                if not distancia_str or not distancia_str.strip():
-                    show_error("❌ La distancia es obligatoria")
-                    return
-                
-                try:
-                    distancia = float(distancia_str.strip())
-                    if distancia < 0:
-                        show_error("❌ La distancia debe ser mayor o igual a 0")
-                        return
-                except ValueError:
-                    show_error("❌ La distancia debe ser un número válido")
-                    return
-                
-                # Cerrar diálogo y crear conexión
-                dlg.open = False
-                self._page_ref.update()
-                
-                parada_destino_id = int(parada_dropdown.value)
-                print(f"Creando conexión: {self.parada.id} -> {parada_destino_id}, Distancia: {distancia}")
-                if self.on_create_connection and self.parada and self.ruta:
-                    self.on_create_connection(self.parada.id, parada_destino_id, distancia, self.ruta.id)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
+        self._create_error_container = ft.Container()
+        self._create_origen_text = ft.Text("", size=12, weight=ft.FontWeight.BOLD)
         
-        dlg = ft.AlertDialog(
+        self._create_dlg = ft.AlertDialog(
             modal=True,
             title=ft.Text("🔗 Crear Nueva Conexión"),
             content=ft.Column([
                 ft.Text("Complete los datos:", size=14),
                 ft.Container(height=10),
-                ft.Text(f"Desde: {self.parada.nombre}", size=12, weight=ft.FontWeight.BOLD),
+                self._create_origen_text,
                 ft.Container(height=10),
-                parada_dropdown,
+                self._create_dropdown,
                 ft.Container(height=10),
-                distancia_field,
+                self._create_distancia_field,
                 ft.Container(height=15),
-                error_container,  # Contenedor para errores
+                self._create_error_container,  # Contenedor para errores
             ], tight=True, height=320),
             actions=[
-                ft.TextButton("Cancelar", on_click=handle_close),
-                ft.ElevatedButton("Crear Conexión", on_click=handle_close, bgcolor="green", color="white"),
+                ft.TextButton("Cancelar", on_click=self._on_create_dialog_action),
+                ft.ElevatedButton("Crear Conexión", on_click=self._on_create_dialog_action, bgcolor="green", color="white"),
             ],
         )
+    
+    def _on_create_dialog_action(self, e):
+        """Maneja los botones del diálogo de creación"""
+        dlg = self._create_dlg
+        error_container = self._create_error_container
+        
+        if e.control.text == "Crear Conexión":
+            # Limpiar errores previos
+            self._clear_form_error(error_container)
+            
+            # Validar parada destino
+            if not self._create_dropdown.value:
+                self._show_form_error(error_container, "❌ Debes seleccionar una parada destino")
+                return
+            
+            # Validar que la parada destino no sea la misma que la parada origen
+            parada_destino_id = int(self._create_dropdown.value)
+            if parada_destino_id == self.parada.id:
+                self._show_form_error(error_container, "❌ Error: No puedes conectar una parada consigo misma")
+                return
+                
+            # Verificar si ya existe una conexión con este destino
+            if any(c.parada_origen_id == self.parada.id and c.parada_destino_id == parada_destino_id
+                   for c in self.conexiones):
+                self._show_form_error(error_container, "❌ Error: Ya existe una conexión con esta parada")
+                return
+            
+            # Validar distancia
+            distancia_str = self._create_distancia_field.value
+            if not distancia_str or not distancia_str.strip():
+                self._show_form_error(error_container, "❌ La distancia es obligatoria")
+                return
+            
+            try:
+                distancia = float(distancia_str.strip())
+                if distancia < 0:
+                    self._show_form_error(error_container, "❌ La distancia debe ser mayor o igual a 0")
+                    return
+            except ValueError:
+                self._show_form_error(error_container, "❌ La distancia debe ser un número válido")
+                return
+            
+            # Cerrar diálogo y crear conexión
+            dlg.open = False
+            self._page_ref.update()
+            
+            logger.debug("Creando conexión: %s -> %s, Distancia: %s", self.parada.id, parada_destino_id, distancia)
+            if self.on_create_connection and self.parada and self.ruta:
+                self._dispatch_callback(self.on_create_connection, self.parada.id, parada_destino_id, distancia, self.ruta.id)
+        else:
+            # Cancelar
+            dlg.open = False
+            self._page_ref.update()
+    
+    def _show_form_error(self, error_container: ft.Container, message: str):
+        """
+        Muestra un mensaje de error en un formulario
+        
+        Args:
+            error_container: Contenedor de errores del formulario
+            message: Mensaje a mostrar
+        """
+        error_container.content = ft.Container(
+            content=ft.Text(
+                message, 
+                color="red", 
+                size=12,
+                text_align=ft.TextAlign.CENTER
+            ),
+            padding=5,
+            border_radius=5,
+            bgcolor="red100",
+            border=ft.border.all(1, "red")
+        )
+        self._page_ref.update()
+    
+    def _clear_form_error(self, error_container: ft.Container):
+        """
+        Limpia el mensaje de error de un formulario
+        
+        Args:
+            error_container: Contenedor de errores del formulario
+        """
+        error_container.content = None
+        self._page_ref.update()
+    
+    @staticmethod
+    def _connections_signature(conexiones: List[Conexion]) -> tuple:
+        """
+        Calcula una firma ligera de una lista de conexiones
         
-        self._page_ref.open(dlg)
+        Args:
+            conexiones: Lista de conexiones
+            
+        Returns:
+            Tupla con los datos visibles de cada conexión
+        """
+        return tuple(
+            (c.parada_origen_id, c.parada_destino_id, c.distancia, c.parada_origen_nombre, c.parada_destino_nombre)
+            for c in conexiones or []
+        )
     
     def _update_connections_content(self):
         """Actualiza el contenido del contenedor de conexiones"""
+        self._last_conexiones_sig = self._connections_signature(self.conexiones)
         if not self.conexiones:
-            # Mostrar mensaje cuando no hay conexiones
-            self.connections_container.content = ft.Container(
-                content=ft.Column([
-                    ft.Text("🔗", size=80),
-                    ft.Text("No hay conexiones desde esta parada", size=18, weight=ft.FontWeight.BOLD, color="grey"),
-                    ft.Text("¡Crea la primera conexión para comenzar!", size=14, color="grey"),
-                    ft.Container(height=15),
-                    ft.Text("💡 Las conexiones definen cómo se puede", size=12, color="grey"),
-                    ft.Text("navegar entre paradas de tu ruta", size=12, color="grey"),
-                ], 
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=8),
-                padding=30,
-                border_radius=10,
-                bgcolor="grey50",
-                border=ft.border.all(1, "grey300"),
-                alignment=ft.alignment.center
-            )
+            # Mostrar mensaje cuando no hay conexiones (se construye una sola vez)
+            if self._empty_state_container is None:
+                self._empty_state_container = _build_empty_state()
+            self.connections_container.content = self._empty_state_container
         else:
-            # Mostrar lista de conexiones
-            connections_list = []
-            
-            for i, conexion in enumerate(self.conexiones):
-                connection_card = self._create_connection_card(conexion, i)
-                connections_list.append(connection_card)
-            
-            self.connections_container.content = ft.Column([
-                ft.Text(f"📋 Total de conexiones: {len(self.conexiones)}", size=14, weight=ft.FontWeight.BOLD, color="grey"),
-                ft.Container(height=10),
-                ft.Column(connections_list, spacing=10)
-            ], 
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=5)
+            # Mostrar lista de conexiones reutilizando el encabezado y la columna
+            self._count_text.value = f"📋 Total de conexiones: {len(self.conexiones)}"
+            self._cards_column.controls = [
+                self._create_connection_card(conexion, i)
+                for i, conexion in enumerate(self.conexiones)
+            ]
+            self.connections_container.content = self._connections_list_content
     
     def _create_connection_card(self, conexion: Conexion, index: int) -> ft.Container:
         """
@@ -389,14 +488,14 @@ class ConexionesView:
                         icon_color="red",
                         icon_size=20,
                         tooltip="Eliminar conexión",
-                        on_click=lambda e, conn=conexion: self._confirm_delete_connection(conn)
+                        on_click=partial(self._on_delete_icon_click, conexion)
                     ),
                     ft.IconButton(
                         icon=ft.Icons.EDIT,
                         icon_color="orange",
                         icon_size=20,
                         tooltip="Editar conexión",
-                        on_click=lambda e, conn=conexion: self._open_edit_connection_form(conn)
+                        on_click=partial(self._on_edit_icon_click, conexion)
                     )
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
             ], spacing=8),
@@ -412,6 +511,14 @@ class ConexionesView:
             width=500
         )
     
+    def _on_delete_icon_click(self, conexion: Conexion, e):
+        """Maneja el click del botón eliminar de una tarjeta"""
+        self._confirm_delete_connection(conexion)
+    
+    def _on_edit_icon_click(self, conexion: Conexion, e):
+        """Maneja el click del botón editar de una tarjeta"""
+        self._open_edit_connection_form(conexion)
+    
     def _confirm_delete_connection(self, conexion: Conexion):
         """
         Muestra el modal de confirmación para eliminar una conexión
@@ -421,7 +528,7 @@ class ConexionesView:
         """
         # Verificar si tenemos referencia a la página
         if not self._page_ref:
-            print("ERROR: No hay referencia a la página (self._page_ref es None)")
+            logger.error("No hay referencia a la página (self._page_ref es None)")
             return
             
         # Determinar nombres para mostrar
@@ -432,20 +539,22 @@ class ConexionesView:
             origen_nombre = conexion.parada_origen_nombre or f"Parada {conexion.parada_origen_id}"
             descripcion = f"Conexión desde: {origen_nombre}"
         
-        def handle_delete(e):
-            if e.control.text == "Sí, eliminar":
-                dlg.open = False
-                self._page_ref.update()
-                
-                print(f"Eliminando conexión: {conexion.parada_origen_id} -> {conexion.parada_destino_id}")
-                if self.on_delete_connection and self.ruta:
-                    self.on_delete_connection(conexion.parada_origen_id, conexion.parada_destino_id, self.ruta.id)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
+        # El diálogo se construye una sola vez; solo cambian los textos
+        if self._delete_dlg is None:
+            self._build_delete_dialog()
+        
+        self._deleting_conexion = conexion
+        self._delete_descripcion_text.value = descripcion
+        self._delete_distancia_text.value = f"Distancia: {conexion.distancia} km"
+        
+        self._page_ref.open(self._delete_dlg)
+    
+    def _build_delete_dialog(self):
+        """Construye el diálogo reutilizable de confirmación de eliminación"""
+        self._delete_descripcion_text = ft.Text("", size=16, weight=ft.FontWeight.BOLD)
+        self._delete_distancia_text = ft.Text("", size=12, color="grey")
         
-        dlg = ft.AlertDialog(
+        self._delete_dlg = ft.AlertDialog(
             modal=True,
             title=ft.Text("⚠️ Confirmar Eliminación"),
             content=ft.Column([
@@ -455,9 +564,9 @@ class ConexionesView:
                     content=ft.Column([
                         ft.Row([
                             ft.Text("🔗", size=16),
-                            ft.Text(descripcion, size=16, weight=ft.FontWeight.BOLD),
+                            self._delete_descripcion_text,
                         ], spacing=8),
-                        ft.Text(f"Distancia: {conexion.distancia} km", size=12, color="grey"),
+                        self._delete_distancia_text,
                     ], spacing=5),
                     padding=10,
                     border_radius=5,
@@ -468,19 +577,28 @@ class ConexionesView:
                 ft.Text("⚠️ Esta acción no se puede deshacer", size=12, color="red", weight=ft.FontWeight.BOLD),
             ], tight=True),
             actions=[
-                ft.TextButton("Cancelar", on_click=handle_delete),
-                ft.ElevatedButton("Sí, eliminar", on_click=handle_delete, bgcolor="red", color="white"),
+                ft.TextButton("Cancelar", on_click=self._on_delete_dialog_action),
+                ft.ElevatedButton("Sí, eliminar", on_click=self._on_delete_dialog_action, bgcolor="red", color="white"),
             ],
         )
-        
-        self._page_ref.open(dlg)
+    
+    def _on_delete_dialog_action(self, e):
+        """Maneja los botones del diálogo de confirmación de eliminación"""
+        conexion = self._deleting_conexion
+        self._delete_dlg.open = False
+        self._page_ref.update()
+        
+        if e.control.text == "Sí, eliminar" and conexion:
+            logger.debug("Eliminando conexión: %s -> %s", conexion.parada_origen_id, conexion.parada_destino_id)
+            if self.on_delete_connection and self.ruta:
+                self._dispatch_callback(self.on_delete_connection, conexion.parada_origen_id, conexion.parada_destino_id, self.ruta.id)
     
     def _open_edit_connection_form(self, conexion: Conexion):
         """Abre el formulario para editar una conexión existente"""
         
         # Verificar si tenemos referencia a la página
         if not self._page_ref:
-            print("ERROR: No hay referencia a la página (self._page_ref es None)")
+            logger.error("No hay referencia a la página (self._page_ref es None)")
             return
         
         # Para editar, permitiremos cambiar tanto la parada destino como la distancia
@@ -497,24 +615,13 @@ class ConexionesView:
         filtered_paradas = self._filter_valid_destinations(self.paradas_disponibles)
         
         # Crear opciones para el dropdown incluyendo todas las paradas disponibles
-        parada_options = []
-        
-        # Asegurarse de incluir siempre la parada actual como opción
-        parada_actual_incluida = False
-        
-        # Agregar todas las paradas disponibles
-        for parada_data in filtered_paradas:
-            parada_options.append(
-                ft.dropdown.Option(
-                    key=str(parada_data["id"]),
-                    text=parada_data["nombre"]
-                )
-            )
-            if parada_data["id"] == parada_actual_id:
-                parada_actual_incluida = True
+        parada_options = [
+            ft.dropdown.Option(key=str(parada_data["id"]), text=parada_data["nombre"])
+            for parada_data in filtered_paradas
+        ]
         
         # Si la parada actual no está en las filtradas, agregarla manualmente
-        if not parada_actual_incluida:
+        if not any(parada_data["id"] == parada_actual_id for parada_data in filtered_paradas):
             parada_options.append(
                 ft.dropdown.Option(
                     key=str(parada_actual_id),
@@ -522,136 +629,124 @@ class ConexionesView:
                 )
             )
         
-        # Usar la distancia actual como valor por defecto
-        distancia_default = conexion.distancia
+        # El diálogo se construye una sola vez y se reinicia en cada apertura
+        if self._edit_dlg is None:
+            self._build_edit_dialog()
+        
+        self._editing_parada_actual_id = parada_actual_id
+        self._edit_dropdown.options = parada_options
+        self._edit_dropdown.value = str(parada_actual_id)  # Valor por defecto (la parada destino actual)
+        self._edit_distancia_field.value = str(conexion.distancia)  # Usar la distancia actual como valor por defecto
+        self._edit_error_container.content = None
+        self._edit_origen_text.value = f"Desde: {self.parada.nombre}"
+        self._edit_destino_text.value = f"Hacia: {parada_actual_nombre}"
         
-        parada_dropdown = ft.Dropdown(
+        self._page_ref.open(self._edit_dlg)
+    
+    def _build_edit_dialog(self):
+        """Construye el diálogo reutilizable para editar conexiones"""
+        self._edit_dropdown = ft.Dropdown(
             label="Parada destino",
             hint_text="Selecciona una parada destino",
-            options=parada_options,
-            value=str(parada_actual_id),  # Valor por defecto (la parada destino actual)
             width=300
         )
         
         # Campo de distancia
-        distancia_field = ft.TextField(
+        self._edit_distancia_field = ft.TextField(
             label="Distancia (km)", 
             hint_text="Ej: 2.5",
-            value=str(distancia_default),  # Valor por defecto
             width=300,
             keyboard_type=ft.KeyboardType.NUMBER
         )
         
         # Contenedor para mensajes de error
-        error_container = ft.Container()
-        
-        def show_error(message):
-            """Muestra un mensaje de error en el formulario"""
-            error_container.content = ft.Container(
-                content=ft.Text(
-                    message, 
-                    color="red", 
-                    size=12,
-                    text_align=ft.TextAlign.CENTER
-                ),
-                padding=5,
-                border_radius=5,
-                bgcolor="red100",
-                border=ft.border.all(1, "red")
-            )
-            self._page_ref.update()
-        
-        def clear_error():
-            """Limpia el mensaje de error"""
-            error_container.content = None
-            self._page_ref.update()
+        self._edit_error_container = ft.Container()
+        self._edit_origen_text = ft.Text("", size=12, weight=ft.FontWeight.BOLD)
+        self._edit_destino_text = ft.Text("", size=12, weight=ft.FontWeight.BOLD)
         
-        def handle_close(e):
-            if e.control.text == "Guardar Cambios":
-                # Limpiar errores previos
-                clear_error()
-                
-                # Validar parada destino seleccionada
-                if not parada_dropdown.value:
-                    show_error("❌ Debes seleccionar una parada destino")
-                    return
-                
-                # Validar que la parada destino no sea la misma que la parada origen
-                parada_destino_id = int(parada_dropdown.value)
-                if parada_destino_id == self.parada.id:
-                    show_error("❌ Error: No puedes conectar una parada consigo misma")
-                    return
-                
-                # Verificar si ya existe una conexión con este destino (excepto la que estamos editando)
-                for con in self.conexiones:
-                    if (con.parada_origen_id == self.parada.id and 
-                        con.parada_destino_id == parada_destino_id and
-                        # Permitir el destino actual
-                        con.parada_destino_id != parada_actual_id):
-                        show_error("❌ Error: Ya existe una conexión con esta parada")
-                        return
-                
-                # Validar distancia (campo obligatorio)
-                distancia_str = distancia_field.value
-                if not distancia_str or not distancia_str.strip():
-                    show_error("❌ Error: La distancia es obligatoria")
-                    return
-                
-                try:
-                    distancia = float(distancia_str.strip())
-                    if distancia < 0:
-                        show_error("❌ Error: La distancia debe ser mayor o igual a 0")
-                        return
-                    if distancia == 0:
-                        # Mostrar una advertencia, pero permitir continuar
-                        show_error("⚠️ Advertencia: Has ingresado una distancia de 0 km")
-                        # No hacemos return para permitir continuar
-                except ValueError:
-                    show_error("❌ Error: La distancia debe ser un número válido")
-                    return
-                
-                # Cerrar diálogo y guardar cambios
-                dlg.open = False
-                self._page_ref.update()
-                
-                parada_destino_id = int(parada_dropdown.value)
-                
-                # Verificar si el destino ha cambiado
-                if parada_destino_id != parada_actual_id:
-                    print(f"Actualizando conexión: {self.parada.id} -> {parada_destino_id} (antes era {parada_actual_id}), Nueva distancia: {distancia}")
-                else:
-                    print(f"Actualizando solo distancia de conexión: {self.parada.id} -> {parada_destino_id}, Nueva distancia: {distancia}")
-                    
-                if self.on_update_connection and self.parada and self.ruta:
-                    # Pasamos el ID de la parada destino anterior para que el controlador sepa si está cambiando
-                    self.on_update_connection(self.parada.id, parada_destino_id, distancia, self.ruta.id, parada_actual_id)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
-        
-        dlg = ft.AlertDialog(
+        self._edit_dlg = ft.AlertDialog(
             modal=True,
             title=ft.Text("✏️ Editar Distancia de Conexión"),
             content=ft.Column([
                 ft.Text("Modifica la distancia de la conexión:", size=14),
                 ft.Container(height=10),
-                ft.Text(f"Desde: {self.parada.nombre}", size=12, weight=ft.FontWeight.BOLD),
-                ft.Text(f"Hacia: {parada_actual_nombre}", size=12, weight=ft.FontWeight.BOLD),
+                self._edit_origen_text,
+                self._edit_destino_text,
                 ft.Container(height=10),
-                parada_dropdown,
+                self._edit_dropdown,
                 ft.Container(height=10),
-                distancia_field,
+                self._edit_distancia_field,
                 ft.Container(height=15),
-                error_container,  # Contenedor para errores
+                self._edit_error_container,  # Contenedor para errores
             ], tight=True, height=320),
             actions=[
-                ft.TextButton("Cancelar", on_click=handle_close),
-                ft.ElevatedButton("Guardar Cambios", on_click=handle_close, bgcolor="green", color="white"),
+                ft.TextButton("Cancelar", on_click=self._on_edit_dialog_action),
+                ft.ElevatedButton("Guardar Cambios", on_click=self._on_edit_dialog_action, bgcolor="green", color="white"),
             ],
         )
-        
-        self._page_ref.open(dlg)
+    
+    def _on_edit_dialog_action(self, e):
+        """Maneja los botones del diálogo de edición"""
+        dlg = self._edit_dlg
+        error_container = self._edit_error_container
+        parada_actual_id = self._editing_parada_actual_id
+        
+        if e.control.text == "Guardar Cambios":
+            # Limpiar errores previos
+            self._clear_form_error(error_container)
+            
+            # Validar parada destino seleccionada
+            if not self._edit_dropdown.value:
+                self._show_form_error(error_container, "❌ Debes seleccionar una parada destino")
+                return
+            
+            # Validar que la parada destino no sea la misma que la parada origen
+            parada_destino_id = int(self._edit_dropdown.value)
+            if parada_destino_id == self.parada.id:
+                self._show_form_error(error_container, "❌ Error: No puedes conectar una parada consigo misma")
+                return
+            
+            # Verificar si ya existe una conexión con este destino (excepto la que estamos editando)
+            if any(c.parada_origen_id == self.parada.id and c.parada_destino_id == parada_destino_id
+                   and c.parada_destino_id != parada_actual_id
+                   for c in self.conexiones):
+                self._show_form_error(error_container, "❌ Error: Ya existe una conexión con esta parada")
+                return
+            
+            # Validar distancia (campo obligatorio)
+            distancia_str = self._edit_distancia_field.value
+            if not distancia_str or not distancia_str.strip():
+                self._show_form_error(error_container, "❌ Error: La distancia es obligatoria")
+                return
+            
+            try:
+                distancia = float(distancia_str.strip())
+                if distancia < 0:
+                    self._show_form_error(error_container, "❌ Error: La distancia debe ser mayor o igual a 0")
+                    return
+            except ValueError:
+                self._show_form_error(error_container, "❌ Error: La distancia debe ser un número válido")
+                return
+            
+            # Cerrar diálogo y guardar cambios
+            dlg.open = False
+            self._page_ref.update()
+            
+            # Verificar si el destino ha cambiado
+            if parada_destino_id != parada_actual_id:
+                logger.debug("Actualizando conexión: %s -> %s (antes era %s), Nueva distancia: %s",
+                             self.parada.id, parada_destino_id, parada_actual_id, distancia)
+            else:
+                logger.debug("Actualizando solo distancia de conexión: %s -> %s, Nueva distancia: %s",
+                             self.parada.id, parada_destino_id, distancia)
+                
+            if self.on_update_connection and self.parada and self.ruta:
+                # Pasamos el ID de la parada destino anterior para que el controlador sepa si está cambiando
+                self._dispatch_callback(self.on_update_connection, self.parada.id, parada_destino_id, distancia, self.ruta.id, parada_actual_id)
+        else:
+            # Cancelar
+            dlg.open = False
+            self._page_ref.update()
     
     def update_connections(self, conexiones: List[Conexion], paradas_disponibles: List[dict] = None):
         """
@@ -661,17 +756,24 @@ class ConexionesView:
             conexiones: Nueva lista de conexiones
             paradas_disponibles: Nueva lista de paradas disponibles (se filtrarán automáticamente)
         """
+        # Evitar reconstruir la vista si los datos no cambiaron
+        new_sig = self._connections_signature(conexiones)
+        if (new_sig == self._last_conexiones_sig and
+                (paradas_disponibles is None or paradas_disponibles == self.paradas_disponibles)):
+            logger.debug("Conexiones sin cambios, se omite la actualización")
+            return
+        
         self.conexiones = conexiones
+        self._connected_ids_cache = None
         if paradas_disponibles is not None:
             self.paradas_disponibles = paradas_disponibles
-            # Filtrar paradas para eliminar las que ya tienen conexión y la actual
-            filtered_paradas = self._filter_valid_destinations(paradas_disponibles)
-            # Imprimir un mensaje de depuración
-            print(f"Paradas disponibles filtradas: {len(filtered_paradas)} de {len(paradas_disponibles)}")
+            # El filtrado solo se calcula para depuración cuando el nivel está activo
+            if logger.isEnabledFor(logging.DEBUG):
+                filtered_paradas = self._filter_valid_destinations(paradas_disponibles)
+                logger.debug("Paradas disponibles filtradas: %d de %d", len(filtered_paradas), len(paradas_disponibles))
             
         self._update_connections_content()
-        if self._page_ref:
-            self._page_ref.update()
+        self._schedule_update()
     
     def show_message(self, message: str, message_type: str = "info"):
         """
@@ -681,31 +783,9 @@ class ConexionesView:
             message: Mensaje a mostrar
             message_type: Tipo de mensaje (info, success, warning, error)
         """
-        color_map = {
-            "info": "blue",
-            "success": "green", 
-            "warning": "orange",
-            "error": "red"
-        }
-        
-        bgcolor_map = {
-            "info": "lightblue100",
-            "success": "lightgreen100", 
-            "warning": "lightyellow100",
-            "error": "lightred100"
-        }
-        
-        color = color_map.get(message_type, "blue")
-        bgcolor = bgcolor_map.get(message_type, "lightblue100")
-        
-        icon_map = {
-            "info": "ℹ️",
-            "success": "",
-            "warning": "⚠️",
-            "error": "❌"
-        }
-        
-        emoji = icon_map.get(message_type, "ℹ️")
+        if message_type not in _VALID_MSG_TYPES:
+            message_type = "info"
+        color, bgcolor, emoji = _STYLE_BY_TYPE[message_type]
         
         self.message_container.content = ft.Container(
             content=ft.Row([
@@ -718,34 +798,71 @@ class ConexionesView:
             border=ft.border.all(1, color)
         )
         
-        if self._page_ref:
-            self._page_ref.update()
+        self._schedule_update()
         
-        # Auto-ocultar mensajes de éxito después de 2 segundos
-        if message_type == "success":
-            import threading
-            import time
-            
-            def auto_hide():
-                time.sleep(2)
-                self.clear_message()
-            
-            thread = threading.Thread(target=auto_hide)
-            thread.daemon = True
-            thread.start()
+        # Auto-ocultar mensajes de éxito tras _AUTO_HIDE_SECONDS
+        # (un único temporizador: cada mensaje nuevo cancela el anterior)
+        if self._hide_task is not None:
+            self._hide_task.cancel()
+            self._hide_task = None
+        if message_type == "success" and self._page_ref is not None:
+            self._hide_task = self._page_ref.run_task(self._auto_hide, _AUTO_HIDE_SECONDS)
+    
+    async def _auto_hide(self, delay: float):
+        """
+        Oculta el mensaje actual tras una espera en el loop de la página
+        
+        Args:
+            delay: Segundos a esperar antes de ocultar el mensaje
+        """
+        await asyncio.sleep(delay)
+        self._hide_task = None
+        self.clear_message()
     
     def clear_message(self):
         """Limpia el mensaje mostrado"""
         self.message_container.content = None
-        if self._page_ref:
-            self._page_ref.update()
+        self._schedule_update()
     
     def _close_dialog(self, dlg):
         """Cierra un diálogo modal"""
         if dlg and hasattr(dlg, "open"):
             dlg.open = False
-            if self._page_ref:
-                self._page_ref.update()
+            self._schedule_update()
+    
+    def _schedule_update(self):
+        """
+        Programa un único page.update() para el siguiente ciclo del loop
+        
+        Varias mutaciones seguidas (mostrar/limpiar mensaje, cerrar diálogo,
+        refrescar la lista) se agrupan en una sola actualización.
+        """
+        if self._page_ref is None or self._update_pending:
+            return
+        self._update_pending = True
+        self._page_ref.run_task(self._flush_update)
+    
+    async def _flush_update(self):
+        """Envía al cliente las mutaciones pendientes"""
+        self._update_pending = False
+        self._page_ref.update()
+    
+    def _dispatch_callback(self, callback: Callable, *args):
+        """
+        Ejecuta un callback del controlador sin bloquear la interfaz
+        
+        Los callbacks asíncronos se programan con page.run_task y los
+        síncronos se ejecutan en un hilo con page.run_thread, de modo que
+        el diálogo se cierra de inmediato mientras se realiza la operación.
+        
+        Args:
+            callback: Función a ejecutar (puede ser async def)
+            *args: Argumentos para el callback
+        """
+        if asyncio.iscoroutinefunction(callback):
+            self._page_ref.run_task(callback, *args)
+        else:
+            self._page_ref.run_thread(callback, *args)
     
     def _filter_valid_destinations(self, paradas_list):
         """
@@ -760,23 +877,32 @@ class ConexionesView:
         if not paradas_list or not self.parada:
             return []
             
-        # Crear una lista de IDs de paradas ya conectadas desde la actual
-        connected_ids = []
-        for conexion in self.conexiones:
-            if conexion.parada_origen_id == self.parada.id:
-                connected_ids.append(conexion.parada_destino_id)
+        connected_ids = self._get_connected_ids()
         
         # Filtrar paradas (excluir la actual y las ya conectadas)
-        filtered_list = []
-        for parada_data in paradas_list:
-            if (parada_data["id"] != self.parada.id and 
-                parada_data["id"] not in connected_ids):
-                filtered_list.append(parada_data)
-                
-        return filtered_list
+        return [
+            parada_data for parada_data in paradas_list
+            if parada_data["id"] != self.parada.id and parada_data["id"] not in connected_ids
+        ]
+    
+    def _get_connected_ids(self) -> set:
+        """
+        Obtiene los IDs de paradas ya conectadas desde la parada actual
+        
+        El conjunto se calcula una vez y se invalida cuando cambian
+        las conexiones o la parada.
+        
+        Returns:
+            Conjunto de IDs de paradas destino
+        """
+        if self._connected_ids_cache is None:
+            self._connected_ids_cache = {
+                c.parada_destino_id for c in self.conexiones
+                if c.parada_origen_id == self.parada.id
+            }
+        return self._connected_ids_cache
     
     def set_page_reference(self, page):
         """Establece referencia a la página para actualizaciones"""
         self._page_ref = page
-        self.page = page  # También actualizamos la propiedad page
-        print(f"DEBUG: Referencia de página establecida en ConexionesView: {page is not None}")
+        logger.debug("Referencia de página establecida en ConexionesView: %s", page is not None)
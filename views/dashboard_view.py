@@ -3,16 +3,116 @@ Vista del Dashboard/Pantalla Principal
 Maneja la interfaz de usuario para la pantalla principal después del login
 Incluye la gestión de rutas directamente en el dashboard
 """
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import cycle
 import flet as ft
 from typing import Callable, Optional, List
 from models import User, Ruta
 
+logger = logging.getLogger(__name__)
+
+
+# Emojis para diferentes índices de tarjetas de ruta
+_ROUTE_EMOJIS = ("🗺️", "📍", "🚩", "🏁", "⭐", "🎯", "📌", "🔵", "🟢", "🟡")
+
+# Estilos de los mensajes según su tipo: (color, bgcolor, emoji)
+_STYLE_BY_TYPE = {
+    "info": ("blue", "lightblue100", "ℹ️"),
+    "success": ("green", "lightgreen100", ""),
+    "warning": ("orange", "lightyellow100", "⚠️"),
+    "error": ("red", "lightred100", "❌")
+}
+_VALID_MSG_TYPES = frozenset(_STYLE_BY_TYPE)
+_MSG_BORDER_BY_TYPE = {t: ft.border.all(1, color) for t, (color, _, _) in _STYLE_BY_TYPE.items()}
+
+# Estilo compartido de las tarjetas de ruta (objetos inmutables, se
+# serializan en cada actualización y pueden reutilizarse entre tarjetas)
+_CARD_BORDER = ft.border.all(1, "grey300")
+_CARD_SHADOW = ft.BoxShadow(spread_radius=1, blur_radius=3, color="grey300")
+
+# Virtualización de la lista de rutas: solo se construyen las tarjetas de la
+# ventana visible; el resto se reemplaza por espacios de altura estimada
+_ROUTES_PAGE_SIZE = 20
+_ESTIMATED_CARD_HEIGHT = 130
+_SCROLL_LOAD_THRESHOLD = 300
+
+# Número máximo de tarjetas renderizadas que se conservan (LRU)
+_CARD_CACHE_SIZE = 128
+
+# Textos fijos del botón "Ver paradas" de cada tarjeta
+_SEE_STOPS_EMOJI = "📋"
+_SEE_STOPS_LABEL = "Ver paradas"
+
+# Segundos que permanece visible un mensaje de éxito
+_AUTO_HIDE_SECONDS = 2
+
+# Estadísticas por defecto del dashboard (no dependen del usuario)
+_DEFAULT_STATS = {
+    "session_start": "Ahora",
+    "last_login": "Primera vez",
+    "user_level": "Básico"
+}
+
+
+def _truncate(text: str, limit: int = 80) -> str:
+    """
+    Trunca un texto agregando "..." si supera el límite
+    
+    Args:
+        text: Texto a truncar
+        limit: Número máximo de caracteres
+        
+    Returns:
+        Texto truncado
+    """
+    # Sondear el carácter siguiente al límite evita calcular len() completo
+    return text[:limit] + "..." if text[limit:limit + 1] else text
+
+
+def _build_empty_routes_state() -> ft.Container:
+    """
+    Construye el contenido mostrado cuando el usuario no tiene rutas
+    
+    Returns:
+        Container con el mensaje de estado vacío
+    """
+    return ft.Container(
+        content=ft.Column([
+            ft.Text("🗺️", size=80),
+            ft.Text("No tienes rutas creadas", size=18, weight=ft.FontWeight.BOLD, color="grey"),
+            ft.Text("¡Crea tu primera ruta para comenzar!", size=14, color="grey"),
+            ft.Container(height=15),
+            ft.Text("💡 Una ruta te permite planificar un recorrido", size=12, color="grey"),
+            ft.Text("con múltiples paradas y conexiones entre ellas", size=12, color="grey"),
+        ], 
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=8),
+        padding=30,
+        border_radius=10,
+        bgcolor="grey50",
+        border=ft.border.all(1, "grey300"),
+        alignment=ft.alignment.center
+    )
+
 
 class DashboardView:
     """
     Vista del dashboard principal
     """
     
+    __slots__ = (
+        "on_logout", "on_create_route", "on_edit_route", "on_delete_route", "on_view_stops",
+        "user", "_user_info_cache", "routes", "message_container", "routes_container", "_empty_routes_container",
+        "_rendered_card_by_id", "_routes_fingerprint", "_route_name_index", "_routes_by_id", "_fecha_cache", "_display_rows", "_count_text", "_routes_list_view", "_visible_count",
+        "_page_ref", "_update_pending", "_suspend_updates", "_hide_task",
+        "_active_ruta", "_form_dialog", "_form_dialog_title", "_form_dialog_intro", "_form_dialog_nombre",
+        "_form_dialog_desc", "_form_dialog_error", "_form_dialog_submit", "_options_dialog", "_options_dialog_title",
+        "_delete_dialog", "_delete_dialog_nombre", "_delete_dialog_desc",
+    )
+    
     def __init__(self, on_logout: Callable, on_create_route: Callable, on_edit_route: Callable = None, on_delete_route: Callable = None, on_view_stops: Callable = None):
         """
         Inicializa la vista del dashboard
@@ -29,13 +129,44 @@ class DashboardView:
         self.on_edit_route = on_edit_route
         self.on_delete_route = on_delete_route
         self.on_view_stops = on_view_stops
-        self.on_view_stops = on_view_stops
         self.user = None
+        self._user_info_cache: Optional[dict] = None
         self.routes = []
         self.message_container = None
         self.routes_container = None
-        self._page_ref = None
-        
+        self._empty_routes_container = None
+        self._rendered_card_by_id = OrderedDict()
+        self._routes_fingerprint = None
+        self._route_name_index = frozenset()
+        self._routes_by_id = {}
+        # Fechas de creación ya formateadas, por ID de ruta
+        self._fecha_cache = {}
+        # Filas de presentación (id, emoji, nombre, descripción, fecha) ya formateadas
+        self._display_rows = []
+        self._count_text = None
+        self._routes_list_view = None
+        self._visible_count = _ROUTES_PAGE_SIZE
+        self._page_ref: Optional[ft.Page] = None
+        self._update_pending = False
+        self._suspend_updates = 0
+        self._hide_task = None
+        # Diálogos reutilizables (se construyen en la primera apertura); la ruta
+        # sobre la que actúan se guarda en _active_ruta al abrirlos
+        self._active_ruta: Optional[Ruta] = None
+        # Formulario compartido de creación (_active_ruta None) y edición
+        self._form_dialog = None
+        self._form_dialog_title = None
+        self._form_dialog_intro = None
+        self._form_dialog_nombre = None
+        self._form_dialog_desc = None
+        self._form_dialog_error = None
+        self._form_dialog_submit = None
+        self._options_dialog = None
+        self._options_dialog_title = None
+        self._delete_dialog = None
+        self._delete_dialog_nombre = None
+        self._delete_dialog_desc = None
+    
     def create(self, user: Optional[User] = None, routes: List[Ruta] = None) -> ft.Container:
         """
         Crea y retorna el contenido de la vista del dashboard
@@ -48,6 +179,7 @@ class DashboardView:
             Container con la vista del dashboard
         """
         self.user = user
+        self._user_info_cache = None
         self.routes = routes or []
         
         # Información del usuario
@@ -56,7 +188,21 @@ class DashboardView:
         
         # Crear contenedores que se actualizarán
         self.message_container = ft.Container()
-        self.routes_container = ft.Container()
+        # Único contenedor con scroll: ocupa el alto restante de la vista
+        self.routes_container = ft.Container(expand=True)
+        
+        # Lista persistente de tarjetas: se parchea en lugar de reconstruirse
+        self._rendered_card_by_id = OrderedDict()
+        # El contador de rutas es el primer control del propio ListView
+        self._count_text = ft.Text("", size=14, weight=ft.FontWeight.BOLD, color="grey", text_align=ft.TextAlign.CENTER)
+        self._visible_count = _ROUTES_PAGE_SIZE
+        self._routes_list_view = ft.ListView(
+            spacing=10,
+            padding=5,
+            auto_scroll=False,
+            expand=True,
+            on_scroll=self._on_routes_scroll
+        )
         
         # Actualizar contenido de rutas
         self._update_routes_content()
@@ -117,8 +263,7 @@ class DashboardView:
                 
             ],
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=10,
-            scroll=ft.ScrollMode.AUTO
+            spacing=10
             ),
             padding=20,
             border_radius=15,
@@ -137,22 +282,53 @@ class DashboardView:
     
     def _on_create_route_click(self, e):
         """Maneja el click del botón crear ruta"""
-        print("DEBUG: Botón 'Nueva Ruta' clicado")
+        logger.debug("Botón 'Nueva Ruta' clicado")
         
-        # SOLUCIÓN SIMPLE: Usar page.open()
-        self._open_simple_form()
+        self._open_route_form()
+    
+    def _open_route_form(self, ruta: Optional[Ruta] = None):
+        """
+        Abre el formulario de rutas (el diálogo se construye una sola vez)
+        
+        Args:
+            ruta: Ruta a editar, o None para crear una nueva
+        """
+        if self._form_dialog is None:
+            self._build_form_dialog()
+        
+        # Configurar el formulario según el modo en cada apertura
+        self._active_ruta = ruta
+        if ruta is None:
+            self._form_dialog_title.value = "🗺️ Crear Nueva Ruta"
+            self._form_dialog_intro.value = "Complete los datos:"
+            self._form_dialog_submit.text = "Crear Ruta"
+            self._form_dialog_submit.bgcolor = "green"
+            self._form_dialog_nombre.value = ""
+            self._form_dialog_desc.value = ""
+        else:
+            self._form_dialog_title.value = "✏️ Editar Ruta"
+            self._form_dialog_intro.value = "Modifica los datos de la ruta:"
+            self._form_dialog_submit.text = "Guardar Cambios"
+            self._form_dialog_submit.bgcolor = "blue"
+            self._form_dialog_nombre.value = ruta.nombre
+            self._form_dialog_desc.value = ruta.descripcion or ""
+        self._form_dialog_error.content = None
+        
+        self._page_ref.open(self._form_dialog)
     
-    def _open_simple_form(self):
-        """Abre un formulario simple que SÍ funciona"""
+    def _build_form_dialog(self):
+        """Construye el diálogo reutilizable para crear y editar rutas"""
+        self._form_dialog_title = ft.Text()
+        self._form_dialog_intro = ft.Text(size=14)
         
         # Crear campos del formulario
-        nombre_field = ft.TextField(
+        self._form_dialog_nombre = ft.TextField(
             label="Nombre de la ruta", 
             hint_text="Ej: Ruta Centro",
             width=300
         )
         
-        descripcion_field = ft.TextField(
+        self._form_dialog_desc = ft.TextField(
             label="Descripción (opcional)", 
             multiline=True, 
             max_lines=2,
@@ -160,81 +336,107 @@ class DashboardView:
         )
         
         # Contenedor para mensajes de error
-        error_container = ft.Container()
-        
-        def show_error(message):
-            """Muestra un mensaje de error en el formulario"""
-            error_container.content = ft.Container(
-                content=ft.Text(
-                    message, 
-                    color="red", 
-                    size=12,
-                    text_align=ft.TextAlign.CENTER
-                ),
-                padding=5,
-                border_radius=5,
-                bgcolor="red100",
-                border=ft.border.all(1, "red")
-            )
-            self._page_ref.update()
+        self._form_dialog_error = ft.Container()
         
-        def clear_error():
-            """Limpia el mensaje de error"""
-            error_container.content = None
-            self._page_ref.update()
+        self._form_dialog_submit = ft.ElevatedButton(on_click=self._on_form_dialog_action, color="white")
         
-        def handle_close(e):
-            if e.control.text == "Crear Ruta":
-                # Limpiar errores previos
-                clear_error()
-                
-                # Validar nombre
-                nombre = nombre_field.value
-                if not nombre or not nombre.strip():
-                    show_error("❌ El nombre de la ruta es obligatorio")
-                    return
-                
-                # Verificar duplicados
-                if self._check_route_name_exists(nombre.strip()):
-                    show_error("❌ Ya existe una ruta con ese nombre")
-                    return
-                
-                # Procesar descripción
-                descripcion = descripcion_field.value
-                descripcion_final = None
-                if descripcion and descripcion.strip():
-                    descripcion_final = descripcion.strip()
-                
-                # Cerrar diálogo y crear ruta
-                dlg.open = False
-                self._page_ref.update()
-                
-                print(f"Creando ruta: {nombre.strip()}, Descripción: {descripcion_final}")
-                self._handle_route_creation(nombre.strip(), descripcion_final)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
-        
-        dlg = ft.AlertDialog(
+        self._form_dialog = ft.AlertDialog(
             modal=True,
-            title=ft.Text("🗺️ Crear Nueva Ruta"),
+            title=self._form_dialog_title,
             content=ft.Column([
-                ft.Text("Complete los datos:", size=14),
+                self._form_dialog_intro,
                 ft.Container(height=10),
-                nombre_field,
+                self._form_dialog_nombre,
                 ft.Container(height=10),
-                descripcion_field,
+                self._form_dialog_desc,
                 ft.Container(height=15),
-                error_container,  # Contenedor para errores
+                self._form_dialog_error,  # Contenedor para errores
             ], tight=True, height=280),
             actions=[
-                ft.TextButton("Cancelar", on_click=handle_close),
-                ft.ElevatedButton("Crear Ruta", on_click=handle_close, bgcolor="green", color="white"),
+                ft.TextButton("Cancelar", on_click=self._on_form_dialog_action),
+                self._form_dialog_submit,
             ],
         )
+    
+    def _on_form_dialog_action(self, e):
+        """Maneja los botones del formulario de creación/edición de rutas"""
+        dlg = self._form_dialog
+        error_container = self._form_dialog_error
+        ruta = self._active_ruta
+        
+        if e.control is not self._form_dialog_submit:
+            # Cancelar
+            dlg.open = False
+            self._update_now()
+            return
         
-        self._page_ref.open(dlg)
+        # Todas las mutaciones del formulario se envían en un único update()
+        with self._batch():
+            # Limpiar errores previos
+            self._clear_form_error(error_container)
+            
+            # Validar nombre
+            nombre = self._form_dialog_nombre.value
+            if not nombre or not nombre.strip():
+                self._show_form_error(error_container, "❌ El nombre de la ruta es obligatorio")
+                return
+            
+            # Verificar duplicados (al editar, solo si el nombre cambió)
+            nombre_nuevo = nombre.strip()
+            nombre_cambio = ruta is None or nombre_nuevo.lower() != ruta.nombre.lower()
+            if nombre_cambio and self._check_route_name_exists(nombre_nuevo):
+                self._show_form_error(error_container, "❌ Ya existe una ruta con ese nombre")
+                return
+            
+            # Procesar descripción
+            descripcion = self._form_dialog_desc.value
+            descripcion_final = None
+            if descripcion and descripcion.strip():
+                descripcion_final = descripcion.strip()
+            
+            # Cerrar diálogo
+            dlg.open = False
+        
+        # Crear o editar la ruta una vez enviado el cierre del diálogo
+        if ruta is None:
+            logger.debug("Creando ruta: %s, Descripción: %s", nombre_nuevo, descripcion_final)
+            self._handle_route_creation(nombre_nuevo, descripcion_final)
+        else:
+            logger.debug("Editando ruta ID %s: %s, Descripción: %s", ruta.id, nombre_nuevo, descripcion_final)
+            if self.on_edit_route:
+                self.on_edit_route(ruta.id, nombre_nuevo, descripcion_final)
+    
+    def _show_form_error(self, error_container: ft.Container, message: str):
+        """
+        Muestra un mensaje de error en un formulario
+        
+        Args:
+            error_container: Contenedor de errores del formulario
+            message: Mensaje a mostrar
+        """
+        error_container.content = ft.Container(
+            content=ft.Text(
+                message, 
+                color="red", 
+                size=12,
+                text_align=ft.TextAlign.CENTER
+            ),
+            padding=5,
+            border_radius=5,
+            bgcolor="red100",
+            border=ft.border.all(1, "red")
+        )
+        self._update_now()
+    
+    def _clear_form_error(self, error_container: ft.Container):
+        """
+        Limpia el mensaje de error de un formulario
+        
+        Args:
+            error_container: Contenedor de errores del formulario
+        """
+        error_container.content = None
+        self._update_now()
     
     def _check_route_name_exists(self, nombre: str) -> bool:
         """
@@ -249,109 +451,7 @@ class DashboardView:
         if not self.user:
             return False
         
-        try:
-            # Obtener todas las rutas del usuario
-            for ruta in self.routes:
-                if ruta.nombre.lower().strip() == nombre.lower().strip():
-                    return True
-            return False
-        except Exception as e:
-            print(f"Error al verificar nombre de ruta: {e}")
-            return False
-    
-    def _show_create_route_dialog_direct(self):
-        """Muestra el formulario para crear ruta usando BottomSheet"""
-        print("DEBUG: Iniciando creación de BottomSheet...")
-        
-        nombre_field = ft.TextField(
-            label="Nombre de la ruta",
-            hint_text="Ej: Ruta Centro Histórico",
-            width=350,
-            autofocus=True
-        )
-        
-        descripcion_field = ft.TextField(
-            label="Descripción (opcional)",
-            hint_text="Describe tu ruta...",
-            multiline=True,
-            max_lines=3,
-            width=350
-        )
-        
-        def crear_ruta(e):
-            print("DEBUG: Botón Crear Ruta presionado")
-            if not nombre_field.value or not nombre_field.value.strip():
-                print("Error: El nombre es obligatorio")
-                nombre_field.error_text = "El nombre es obligatorio"
-                self._page_ref.update()
-                return
-            
-            print(f"DEBUG: Cerrando BottomSheet y creando ruta: {nombre_field.value}")
-            # Cerrar BottomSheet
-            self._page_ref.bottom_sheet.open = False
-            self._page_ref.update()
-            
-            # Crear la ruta
-            self._handle_route_creation(nombre_field.value.strip(), descripcion_field.value or "")
-        
-        def cancelar(e):
-            print("DEBUG: Cancelando BottomSheet")
-            self._page_ref.bottom_sheet.open = False
-            self._page_ref.update()
-        
-        # Crear BottomSheet
-        bottom_sheet = ft.BottomSheet(
-            content=ft.Container(
-                content=ft.Column([
-                    # Título
-                    ft.Row([
-                        ft.Icon(ft.Icons.ADD_LOCATION, color="green"),
-                        ft.Text("Crear Nueva Ruta", size=20, weight=ft.FontWeight.BOLD),
-                    ], spacing=10),
-                    
-                    ft.Divider(),
-                    
-                    # Campos del formulario
-                    nombre_field,
-                    ft.Container(height=10),
-                    descripcion_field,
-                    ft.Container(height=20),
-                    
-                    # Botones
-                    ft.Row([
-                        ft.ElevatedButton(
-                            "Cancelar", 
-                            on_click=cancelar,
-                            bgcolor="grey",
-                            color="white",
-                            width=150
-                        ),
-                        ft.ElevatedButton(
-                            "Crear Ruta", 
-                            on_click=crear_ruta, 
-                            bgcolor="green", 
-                            color="white",
-                            width=150
-                        ),
-                    ], alignment=ft.MainAxisAlignment.SPACE_AROUND),
-                    
-                    ft.Container(height=20),
-                    
-                ], spacing=10, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                padding=30,
-                width=400
-            ),
-            open=True
-        )
-        
-        print("DEBUG: Configurando BottomSheet en página...")
-        # Mostrar BottomSheet
-        if self._page_ref:
-            self._page_ref.bottom_sheet = bottom_sheet
-            self._page_ref.update()
-            print("DEBUG: ¡BottomSheet configurado y mostrado!")
-        else:
-            print("ERROR: No hay referencia a la página")
+        return nombre.lower().strip() in self._route_name_index
     
     def _handle_route_creation(self, nombre: str, descripcion: Optional[str]):
         """
@@ -361,79 +461,161 @@ class DashboardView:
             nombre: Nombre de la ruta
             descripcion: Descripción de la ruta (puede ser None)
         """
-        print(f"DEBUG: Creando ruta - Nombre: {nombre}, Descripción: {descripcion}")
+        logger.debug("Creando ruta - Nombre: %s, Descripción: %s", nombre, descripcion)
         # Llamar al callback principal
         if self.on_create_route:
             self.on_create_route(nombre, descripcion)
     
-    def _handle_form_cancel(self):
-        """Maneja la cancelación del formulario"""
-        print("DEBUG: Formulario de crear ruta cancelado")
+    def _format_fecha(self, ruta: Ruta) -> str:
+        """
+        Formatea la fecha de creación de una ruta (una sola vez por ruta)
+        
+        Args:
+            ruta: Objeto Ruta
+            
+        Returns:
+            Fecha en formato dd/mm/aaaa
+        """
+        fecha_text = self._fecha_cache.get(ruta.id)
+        if fecha_text is None:
+            fecha_text = "Fecha no disponible"
+            if ruta.created_at:
+                try:
+                    fecha_text = ruta.created_at.strftime("%d/%m/%Y")
+                except:
+                    fecha_text = str(ruta.created_at)
+            self._fecha_cache[ruta.id] = fecha_text
+        return fecha_text
     
-    def _update_routes_content(self):
-        """Actualiza el contenido del contenedor de rutas"""
+    @staticmethod
+    def _routes_fingerprint_of(routes: List[Ruta]) -> tuple:
+        """
+        Calcula una huella ligera de una lista de rutas
+        
+        Args:
+            routes: Lista de rutas
+            
+        Returns:
+            Tupla con los datos visibles de cada ruta
+        """
+        # Se guarda la tupla completa (no solo su hash): la comparación con ==
+        # es exacta y una colisión de hash no puede descartar una actualización
+        return tuple((r.id, r.nombre, r.descripcion, r.created_at) for r in routes or [])
+    
+    def _update_routes_content(self, fingerprint: Optional[tuple] = None):
+        """
+        Actualiza el contenido del contenedor de rutas
+        
+        Args:
+            fingerprint: Huella de self.routes si ya fue calculada
+        """
+        if fingerprint is None:
+            fingerprint = self._routes_fingerprint_of(self.routes)
+        self._routes_fingerprint = fingerprint
+        # Índice de nombres normalizados para la verificación de duplicados
+        self._route_name_index = frozenset(r.nombre.lower().strip() for r in self.routes if r.nombre)
+        # Rutas por ID para los botones de las tarjetas (que solo guardan el ID)
+        self._routes_by_id = {r.id: r for r in self.routes}
+        # Descartar las fechas de rutas que ya no están en la lista
+        for route_id in list(self._fecha_cache):
+            if route_id not in self._routes_by_id:
+                del self._fecha_cache[route_id]
         if not self.routes:
-            # Mostrar mensaje cuando no hay rutas
-            self.routes_container.content = ft.Container(
-                content=ft.Column([
-                    ft.Text("🗺️", size=80),
-                    ft.Text("No tienes rutas creadas", size=18, weight=ft.FontWeight.BOLD, color="grey"),
-                    ft.Text("¡Crea tu primera ruta para comenzar!", size=14, color="grey"),
-                    ft.Container(height=15),
-                    ft.Text("💡 Una ruta te permite planificar un recorrido", size=12, color="grey"),
-                    ft.Text("con múltiples paradas y conexiones entre ellas", size=12, color="grey"),
-                ], 
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=8),
-                padding=30,
-                border_radius=10,
-                bgcolor="grey50",
-                border=ft.border.all(1, "grey300"),
-                alignment=ft.alignment.center
-            )
+            # Mostrar mensaje cuando no hay rutas (se construye en el primer uso
+            # y se reutiliza en los siguientes refrescos, su contenido es fijo)
+            self._display_rows = []
+            if self._empty_routes_container is None:
+                self._empty_routes_container = _build_empty_routes_state()
+            self.routes_container.content = self._empty_routes_container
         else:
-            # Mostrar lista de rutas
-            routes_list = []
+            # Mostrar lista de rutas reutilizando las tarjetas que no cambiaron
+            new_ids = {ruta.id for ruta in self.routes}
+            for route_id in list(self._rendered_card_by_id):
+                if route_id not in new_ids:
+                    del self._rendered_card_by_id[route_id]
             
-            for i, ruta in enumerate(self.routes):
-                route_card = self._create_route_card(ruta, i)
-                routes_list.append(route_card)
+            # Los textos derivados se calculan una vez por actualización
+            self._display_rows = [
+                (
+                    ruta.id,
+                    emoji,
+                    ruta.nombre,
+                    _truncate(ruta.descripcion) if ruta.descripcion else "Sin descripción",
+                    self._format_fecha(ruta),
+                )
+                for ruta, emoji in zip(self.routes, cycle(_ROUTE_EMOJIS))
+            ]
             
-            self.routes_container.content = ft.Column([
-                ft.Text(f"📋 Total de rutas: {len(self.routes)}", size=14, weight=ft.FontWeight.BOLD, color="grey"),
-                ft.Container(height=10),
-                ft.Column(routes_list, spacing=10)
-            ], 
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=5)
+            # Solo se materializan las tarjetas de la ventana visible; la lista
+            # se reserva completa y se asigna al ListView de una sola vez
+            visible_end = self._visible_count
+            self._count_text.value = f"📋 Total de rutas: {len(self.routes)}"
+            controls = [None] * (len(self._display_rows) + 1)
+            controls[0] = self._count_text
+            for i, row in enumerate(self._display_rows):
+                controls[i + 1] = self._get_route_card(row) if i < visible_end else self._create_route_placeholder()
+            self._routes_list_view.controls = controls
+            self.routes_container.content = self._routes_list_view
     
-    def _create_route_card(self, ruta: Ruta, index: int) -> ft.Container:
+    def _on_routes_scroll(self, e):
         """
-        Crea una tarjeta para mostrar una ruta
+        Amplía la ventana de tarjetas materializadas al acercarse al final de la lista
         
         Args:
-            ruta: Objeto Ruta
-            index: Índice en la lista
+            e: Evento de scroll del ListView
+        """
+        if self._visible_count >= len(self.routes):
+            return
+        if e.pixels < e.max_scroll_extent - _SCROLL_LOAD_THRESHOLD:
+            return
+        
+        start = self._visible_count
+        self._visible_count = min(start + _ROUTES_PAGE_SIZE, len(self.routes))
+        controls = self._routes_list_view.controls
+        for i in range(start, self._visible_count):
+            # controls[0] es el contador de rutas
+            controls[i + 1] = self._get_route_card(self._display_rows[i])
+        self._schedule_update()
+    
+    @staticmethod
+    def _create_route_placeholder() -> ft.Container:
+        """Crea un espacio reservado con la altura estimada de una tarjeta"""
+        return ft.Container(height=_ESTIMATED_CARD_HEIGHT)
+    
+    def _get_route_card(self, row: tuple) -> ft.Container:
+        """
+        Obtiene la tarjeta de una ruta, reutilizando la ya renderizada si sus datos no cambiaron
+        
+        Args:
+            row: Fila de presentación (id, emoji, nombre, descripción, fecha)
             
         Returns:
             Container con la tarjeta de la ruta
         """
-        # Emojis para diferentes índices
-        emojis = ["🗺️", "📍", "🚩", "🏁", "⭐", "🎯", "📌", "🔵", "🟢", "🟡"]
-        emoji = emojis[index % len(emojis)]
-        
-        # Descripción truncada
-        descripcion_text = ruta.descripcion if ruta.descripcion else "Sin descripción"
-        if len(descripcion_text) > 80:
-            descripcion_text = descripcion_text[:80] + "..."
+        route_id = row[0]
+        cached = self._rendered_card_by_id.get(route_id)
+        if cached is not None and cached[0] == row:
+            self._rendered_card_by_id.move_to_end(route_id)
+            return cached[1]
+        
+        route_card = self._create_route_card(row)
+        self._rendered_card_by_id[route_id] = (row, route_card)
+        self._rendered_card_by_id.move_to_end(route_id)
+        if len(self._rendered_card_by_id) > _CARD_CACHE_SIZE:
+            self._rendered_card_by_id.popitem(last=False)
+        return route_card
+    
+    def _create_route_card(self, row: tuple) -> ft.Container:
+        """
+        Crea una tarjeta para mostrar una ruta
         
-        # Fecha de creación
-        fecha_text = "Fecha no disponible"
-        if ruta.created_at:
-            try:
-                fecha_text = ruta.created_at.strftime("%d/%m/%Y")
-            except:
-                fecha_text = str(ruta.created_at)
+        Args:
+            row: Fila de presentación (id, emoji, nombre, descripción, fecha)
+            
+        Returns:
+            Container con la tarjeta de la ruta
+        """
+        route_id, emoji, nombre, descripcion_text, fecha_text = row
         
         return ft.Container(
             content=ft.Column([
@@ -441,14 +623,15 @@ class DashboardView:
                 ft.Row([
                     ft.Text(emoji, size=24),
                     ft.Column([
-                        ft.Text(ruta.nombre, size=16, weight=ft.FontWeight.BOLD),
-                        ft.Text(f"ID: {ruta.id}", size=10, color="grey"),
+                        ft.Text(nombre, size=16, weight=ft.FontWeight.BOLD),
+                        ft.Text(f"ID: {route_id}", size=10, color="grey"),
                     ], spacing=2, expand=True),
                     ft.IconButton(
                         icon=ft.Icons.MORE_VERT,
                         icon_size=20,
                         tooltip="Opciones",
-                        on_click=lambda e, route=ruta: self._show_route_options(route)
+                        data=route_id,
+                        on_click=self._on_route_options_click
                     )
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 
@@ -460,25 +643,34 @@ class DashboardView:
                     ft.Text(f"📅 {fecha_text}", size=10, color="grey"),
                     ft.TextButton(
                         content=ft.Row([
-                            ft.Text("📋", size=12),
-                            ft.Text("Ver paradas", size=10),
+                            ft.Text(_SEE_STOPS_EMOJI, size=12),
+                            ft.Text(_SEE_STOPS_LABEL, size=10),
                         ], spacing=3),
-                        on_click=lambda e, route=ruta: self._on_view_stops_click(route)
+                        data=route_id,
+                        on_click=self._on_route_view_stops_click
                     )
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
             ], spacing=8),
             padding=15,
             border_radius=8,
             bgcolor="white",
-            border=ft.border.all(1, "grey300"),
-            shadow=ft.BoxShadow(
-                spread_radius=1,
-                blur_radius=3,
-                color="grey300",
-            ),
+            border=_CARD_BORDER,
+            shadow=_CARD_SHADOW,
             width=500
         )
     
+    def _on_route_options_click(self, e):
+        """Abre las opciones de la ruta cuyo ID guarda el botón pulsado"""
+        ruta = self._routes_by_id.get(e.control.data)
+        if ruta is not None:
+            self._show_route_options(ruta)
+    
+    def _on_route_view_stops_click(self, e):
+        """Abre las paradas de la ruta cuyo ID guarda el botón pulsado"""
+        ruta = self._routes_by_id.get(e.control.data)
+        if ruta is not None:
+            self._on_view_stops_click(ruta)
+    
     def update_routes(self, routes: List[Ruta]):
         """
         Actualiza la lista de rutas mostrada
@@ -486,10 +678,14 @@ class DashboardView:
         Args:
             routes: Nueva lista de rutas
         """
+        # Evitar re-renderizar si la lista es idéntica a la última mostrada
+        fingerprint = self._routes_fingerprint_of(routes)
+        if fingerprint == self._routes_fingerprint:
+            return
+        
         self.routes = routes
-        self._update_routes_content()
-        if self._page_ref:
-            self._page_ref.update()
+        self._update_routes_content(fingerprint)
+        self._schedule_update()
     
     def show_message(self, message: str, message_type: str = "info"):
         """
@@ -499,31 +695,9 @@ class DashboardView:
             message: Mensaje a mostrar
             message_type: Tipo de mensaje (info, success, warning, error)
         """
-        color_map = {
-            "info": "blue",
-            "success": "green", 
-            "warning": "orange",
-            "error": "red"
-        }
-        
-        bgcolor_map = {
-            "info": "lightblue100",
-            "success": "lightgreen100", 
-            "warning": "lightyellow100",
-            "error": "lightred100"
-        }
-        
-        color = color_map.get(message_type, "blue")
-        bgcolor = bgcolor_map.get(message_type, "lightblue100")
-        
-        icon_map = {
-            "info": "ℹ️",
-            "success": "",
-            "warning": "⚠️",
-            "error": "❌"
-        }
-        
-        emoji = icon_map.get(message_type, "ℹ️")
+        if message_type not in _VALID_MSG_TYPES:
+            message_type = "info"
+        color, bgcolor, emoji = _STYLE_BY_TYPE[message_type]
         
         self.message_container.content = ft.Container(
             content=ft.Row([
@@ -533,35 +707,76 @@ class DashboardView:
             padding=12,
             border_radius=6,
             bgcolor=bgcolor,
-            border=ft.border.all(1, color)
+            border=_MSG_BORDER_BY_TYPE[message_type]
         )
         
-        if self._page_ref:
-            self._page_ref.update()
+        self._schedule_update()
         
-        # Auto-ocultar mensajes de éxito después de 2 segundos
-        if message_type == "success":
-            import threading
-            import time
-            
-            def auto_hide():
-                time.sleep(2)
-                self.clear_message()
-            
-            thread = threading.Thread(target=auto_hide)
-            thread.daemon = True
-            thread.start()
+        # Auto-ocultar mensajes de éxito tras _AUTO_HIDE_SECONDS
+        # (un único temporizador: cada mensaje nuevo cancela el anterior)
+        if self._hide_task is not None:
+            self._hide_task.cancel()
+            self._hide_task = None
+        if message_type == "success" and self._page_ref is not None:
+            self._hide_task = self._page_ref.run_task(self._auto_hide, _AUTO_HIDE_SECONDS)
+    
+    async def _auto_hide(self, delay: float):
+        """
+        Oculta el mensaje actual tras una espera en el loop de la página
+        
+        Args:
+            delay: Segundos a esperar antes de ocultar el mensaje
+        """
+        await asyncio.sleep(delay)
+        self._hide_task = None
+        self.clear_message()
     
     def clear_message(self):
         """Limpia el mensaje mostrado"""
         self.message_container.content = None
-        if self._page_ref:
+        self._schedule_update()
+    
+    def _schedule_update(self):
+        """
+        Programa un único page.update() para el siguiente ciclo del loop
+        
+        Varias mutaciones seguidas (mostrar/limpiar mensaje, cerrar diálogo,
+        refrescar la lista) se agrupan en una sola actualización.
+        """
+        if self._page_ref is None or self._update_pending:
+            return
+        self._update_pending = True
+        self._page_ref.run_task(self._flush_update)
+    
+    async def _flush_update(self):
+        """Envía al cliente las mutaciones pendientes"""
+        self._update_pending = False
+        self._page_ref.update()
+    
+    @contextmanager
+    def _batch(self):
+        """
+        Agrupa las mutaciones del bloque en un único page.update() al salir
+        
+        Los bloques pueden anidarse; solo el más externo envía la actualización.
+        """
+        self._suspend_updates += 1
+        try:
+            yield
+        finally:
+            self._suspend_updates -= 1
+            if self._suspend_updates == 0:
+                self._update_now()
+    
+    def _update_now(self):
+        """Envía las mutaciones al cliente, salvo dentro de un bloque _batch()"""
+        if self._suspend_updates == 0 and self._page_ref is not None:
             self._page_ref.update()
     
     def set_page_reference(self, page):
         """Establece referencia a la página para actualizaciones"""
         self._page_ref = page
-        print(f"DEBUG: Referencia de página establecida: {page is not None}")
+        logger.debug("Referencia de página establecida: %s", page is not None)
     
     def update_user_info(self, user: User):
         """
@@ -571,6 +786,7 @@ class DashboardView:
             user: Usuario actualizado
         """
         self.user = user
+        self._user_info_cache = None
     
     def get_user_info(self) -> dict:
         """
@@ -582,11 +798,14 @@ class DashboardView:
         if not self.user:
             return {}
         
-        return {
-            "id": self.user.id,
-            "nombre": self.user.nombre,
-            "correo": self.user.correo
-        }
+        # Se construye una vez por usuario y se invalida al cambiarlo
+        if self._user_info_cache is None:
+            self._user_info_cache = {
+                "id": self.user.id,
+                "nombre": self.user.nombre,
+                "correo": self.user.correo
+            }
+        return self._user_info_cache
     
     def show_notification(self, message: str, notification_type: str = "info"):
         """
@@ -596,15 +815,10 @@ class DashboardView:
             message: Mensaje a mostrar
             notification_type: Tipo de notificación (info, success, warning, error)
         """
-        color_map = {
-            "info": "blue",
-            "success": "green", 
-            "warning": "orange",
-            "error": "red"
-        }
-        
-        color = color_map.get(notification_type, "blue")
-        print(f"Notificación ({color}): {message}")
+        if notification_type not in _VALID_MSG_TYPES:
+            notification_type = "info"
+        color = _STYLE_BY_TYPE[notification_type][0]
+        logger.info("Notificación (%s): %s", color, message)
     
     def add_quick_action(self, name: str, callback: Callable, icon: str = "STAR"):
         """
@@ -615,7 +829,7 @@ class DashboardView:
             callback: Función a ejecutar
             icon: Icono de la acción
         """
-        print(f"Acción rápida añadida: {name}")
+        logger.debug("Acción rápida añadida: %s", name)
     
     def get_dashboard_stats(self) -> dict:
         """
@@ -624,11 +838,7 @@ class DashboardView:
         Returns:
             Dict con estadísticas
         """
-        return {
-            "session_start": "Ahora",
-            "last_login": "Primera vez",
-            "user_level": "Básico"
-        }
+        return _DEFAULT_STATS
     
     def _show_route_options(self, ruta: Ruta):
         """
@@ -637,139 +847,47 @@ class DashboardView:
         Args:
             ruta: La ruta seleccionada
         """
-        def handle_option(e):
-            dlg.open = False
-            self._page_ref.update()
-            
-            # Usar el título del ListTile para identificar la acción
-            if e.control.title.value == "Editar ruta":
-                self._edit_route(ruta)
-            elif e.control.title.value == "Eliminar ruta":
-                self._confirm_delete_route(ruta)
+        if self._options_dialog is None:
+            self._build_options_dialog()
         
-        dlg = ft.AlertDialog(
+        self._active_ruta = ruta
+        self._options_dialog_title.value = f"Opciones para: {ruta.nombre}"
+        self._page_ref.open(self._options_dialog)
+    
+    def _build_options_dialog(self):
+        """Construye el diálogo reutilizable de opciones de una ruta"""
+        self._options_dialog_title = ft.Text()
+        self._options_dialog = ft.AlertDialog(
             modal=True,
-            title=ft.Text(f"Opciones para: {ruta.nombre}"),
+            title=self._options_dialog_title,
             content=ft.Column([
                 ft.ListTile(
                     leading=ft.Icon(ft.Icons.EDIT, color="blue"),
                     title=ft.Text("Editar ruta"),
-                    on_click=handle_option
+                    data=self._open_route_form,
+                    on_click=self._on_route_option_click
                 ),
                 ft.ListTile(
                     leading=ft.Icon(ft.Icons.DELETE, color="red"),
                     title=ft.Text("Eliminar ruta"),
-                    on_click=handle_option
+                    data=self._confirm_delete_route,
+                    on_click=self._on_route_option_click
                 ),
             ], tight=True),
             actions=[
-                ft.TextButton("Cancelar", on_click=lambda e: self._close_dialog(dlg)),
+                ft.TextButton("Cancelar", on_click=lambda e: self._close_dialog(self._options_dialog)),
             ],
         )
-        
-        self._page_ref.open(dlg)
     
-    def _edit_route(self, ruta: Ruta):
-        """
-        Abre el formulario de edición para una ruta existente
-        
-        Args:
-            ruta: La ruta a editar
-        """
-        # Crear campos del formulario pre-llenados
-        nombre_field = ft.TextField(
-            label="Nombre de la ruta", 
-            hint_text="Ej: Ruta Centro",
-            width=300,
-            value=ruta.nombre
-        )
-        
-        descripcion_field = ft.TextField(
-            label="Descripción (opcional)", 
-            multiline=True, 
-            max_lines=2,
-            width=300,
-            value=ruta.descripcion or ""
-        )
-        
-        # Contenedor para mensajes de error
-        error_container = ft.Container()
-        
-        def show_error(message):
-            """Muestra un mensaje de error en el formulario"""
-            error_container.content = ft.Container(
-                content=ft.Text(
-                    message, 
-                    color="red", 
-                    size=12,
-                    text_align=ft.TextAlign.CENTER
-                ),
-                padding=5,
-                border_radius=5,
-                bgcolor="red100",
-                border=ft.border.all(1, "red")
-            )
-            self._page_ref.update()
-        
-        def clear_error():
-            """Limpia el mensaje de error"""
-            error_container.content = None
-            self._page_ref.update()
-        
-        def handle_close(e):
-            if e.control.text == "Guardar Cambios":
-                # Limpiar errores previos
-                clear_error()
-                
-                # Validar nombre
-                nombre = nombre_field.value
-                if not nombre or not nombre.strip():
-                    show_error("❌ El nombre de la ruta es obligatorio")
-                    return
-                
-                # Verificar duplicados (solo si el nombre cambió)
-                nombre_nuevo = nombre.strip()
-                if nombre_nuevo.lower() != ruta.nombre.lower() and self._check_route_name_exists(nombre_nuevo):
-                    show_error("❌ Ya existe una ruta con ese nombre")
-                    return
-                
-                # Procesar descripción
-                descripcion = descripcion_field.value
-                descripcion_final = None
-                if descripcion and descripcion.strip():
-                    descripcion_final = descripcion.strip()
-                
-                # Cerrar diálogo y editar ruta
-                dlg.open = False
-                self._page_ref.update()
-                
-                print(f"Editando ruta ID {ruta.id}: {nombre_nuevo}, Descripción: {descripcion_final}")
-                if self.on_edit_route:
-                    self.on_edit_route(ruta.id, nombre_nuevo, descripcion_final)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
-        
-        dlg = ft.AlertDialog(
-            modal=True,
-            title=ft.Text("✏️ Editar Ruta"),
-            content=ft.Column([
-                ft.Text("Modifica los datos de la ruta:", size=14),
-                ft.Container(height=10),
-                nombre_field,
-                ft.Container(height=10),
-                descripcion_field,
-                ft.Container(height=15),
-                error_container,  # Contenedor para errores
-            ], tight=True, height=280),
-            actions=[
-                ft.TextButton("Cancelar", on_click=handle_close),
-                ft.ElevatedButton("Guardar Cambios", on_click=handle_close, bgcolor="blue", color="white"),
-            ],
-        )
-        
-        self._page_ref.open(dlg)
+    def _on_route_option_click(self, e):
+        """Maneja la selección de una opción del diálogo de opciones"""
+        # Enviar el cierre antes de abrir el siguiente diálogo: si este ya
+        # está construido, page.open() no vuelve a enviar el de opciones
+        self._options_dialog.open = False
+        self._update_now()
+        
+        # Cada ListTile guarda en data la acción que ejecuta sobre la ruta
+        e.control.data(self._active_ruta)
     
     def _confirm_delete_route(self, ruta: Ruta):
         """
@@ -778,20 +896,21 @@ class DashboardView:
         Args:
             ruta: La ruta a eliminar
         """
-        def handle_delete(e):
-            if e.control.text == "Sí, eliminar":
-                dlg.open = False
-                self._page_ref.update()
-                
-                print(f"Eliminando ruta ID {ruta.id}: {ruta.nombre}")
-                if self.on_delete_route:
-                    self.on_delete_route(ruta.id, ruta.nombre)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
-        
-        dlg = ft.AlertDialog(
+        if self._delete_dialog is None:
+            self._build_delete_dialog()
+        
+        self._active_ruta = ruta
+        self._delete_dialog_nombre.value = ruta.nombre
+        self._delete_dialog_desc.value = ruta.descripcion or "Sin descripción"
+        
+        self._page_ref.open(self._delete_dialog)
+    
+    def _build_delete_dialog(self):
+        """Construye el diálogo reutilizable de confirmación de eliminación"""
+        self._delete_dialog_nombre = ft.Text(size=16, weight=ft.FontWeight.BOLD)
+        self._delete_dialog_desc = ft.Text(size=12, color="grey")
+        
+        self._delete_dialog = ft.AlertDialog(
             modal=True,
             title=ft.Text("⚠️ Confirmar Eliminación"),
             content=ft.Column([
@@ -801,9 +920,9 @@ class DashboardView:
                     content=ft.Column([
                         ft.Row([
                             ft.Text("📛", size=16),
-                            ft.Text(ruta.nombre, size=16, weight=ft.FontWeight.BOLD),
+                            self._delete_dialog_nombre,
                         ], spacing=8),
-                        ft.Text(ruta.descripcion or "Sin descripción", size=12, color="grey"),
+                        self._delete_dialog_desc,
                     ], spacing=5),
                     padding=10,
                     border_radius=5,
@@ -814,17 +933,27 @@ class DashboardView:
                 ft.Text("⚠️ Esta acción no se puede deshacer", size=12, color="red", weight=ft.FontWeight.BOLD),
             ], tight=True),
             actions=[
-                ft.TextButton("Cancelar", on_click=handle_delete),
-                ft.ElevatedButton("Sí, eliminar", on_click=handle_delete, bgcolor="red", color="white"),
+                ft.TextButton("Cancelar", on_click=self._on_delete_dialog_action),
+                ft.ElevatedButton("Sí, eliminar", on_click=self._on_delete_dialog_action, bgcolor="red", color="white"),
             ],
         )
+    
+    def _on_delete_dialog_action(self, e):
+        """Maneja los botones del diálogo de confirmación de eliminación"""
+        ruta = self._active_ruta
+        
+        self._delete_dialog.open = False
+        self._update_now()
         
-        self._page_ref.open(dlg)
+        if e.control.text == "Sí, eliminar":
+            logger.debug("Eliminando ruta ID %s: %s", ruta.id, ruta.nombre)
+            if self.on_delete_route:
+                self.on_delete_route(ruta.id, ruta.nombre)
     
     def _close_dialog(self, dialog):
         """Cierra un diálogo"""
         dialog.open = False
-        self._page_ref.update()
+        self._schedule_update()
     
     def _on_view_stops_click(self, ruta: Ruta):
         """
@@ -833,6 +962,6 @@ class DashboardView:
         Args:
             ruta: La ruta seleccionada
         """
-        print(f"DEBUG: Ver paradas clicado para ruta: {ruta.nombre}")
+        logger.debug("Ver paradas clicado para ruta: %s", ruta.nombre)
         if self.on_view_stops:
             self.on_view_stops(ruta)
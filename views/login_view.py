@@ -2,8 +2,42 @@
 Vista de Login
 Maneja la interfaz de usuario para el inicio de sesión
 """
+import asyncio
 import flet as ft
 from typing import Callable, Optional
+from core.config import AppConfig
+from views.view_utils import mounted_page
+
+
+# Espera tras la última pulsación antes de limpiar el mensaje de estado
+_CLEAR_DEBOUNCE_SECONDS = AppConfig.UI_CONFIG["status_clear_debounce"]
+
+# Valores de enumeraciones de Flet usados al construir la vista
+_ICON_EMAIL = ft.Icons.EMAIL
+_ICON_LOCK = ft.Icons.LOCK
+_KB_EMAIL = ft.KeyboardType.EMAIL
+_BOLD = ft.FontWeight.BOLD
+_TA_CENTER = ft.TextAlign.CENTER
+_CA_CENTER = ft.CrossAxisAlignment.CENTER
+_MA_CENTER = ft.MainAxisAlignment.CENTER
+
+# Sombra de la tarjeta de login (objeto inmutable, se comparte entre vistas)
+_LOGIN_SHADOW = ft.BoxShadow(spread_radius=2, blur_radius=20, color="grey400")
+
+
+def _build_header() -> tuple:
+    """
+    Construye los controles fijos del encabezado del login
+    
+    Returns:
+        Tupla con el logo, el título, el subtítulo y el separador
+    """
+    return (
+        ft.Text("🏢", size=60),
+        ft.Text("Tours App", size=28, weight=_BOLD),
+        ft.Text("Iniciar Sesión", size=18, color="grey"),
+        ft.Divider(height=30),
+    )
 
 
 class LoginView:
@@ -11,6 +45,13 @@ class LoginView:
     Vista del formulario de login
     """
     
+    __slots__ = (
+        "on_login", "on_go_to_register",
+        "txt_correo", "txt_clave", "msg_status", "btn_login", "_loading",
+        "_container", "_status_dirty", "_clear_task", "_status_update_scheduled",
+        "_cb_login", "_cb_register", "_cb_field_change",
+    )
+    
     def __init__(self, on_login: Callable, on_go_to_register: Callable):
         """
         Inicializa la vista de login
@@ -26,6 +67,25 @@ class LoginView:
         self.txt_correo = None
         self.txt_clave = None
         self.msg_status = None
+        self.btn_login = None
+        
+        # True mientras se procesa un intento de login
+        self._loading = False
+        
+        # Limpieza diferida del mensaje de estado mientras se escribe
+        self._clear_task = None
+        # True mientras msg_status muestra un mensaje (evita leer el control en cada tecla)
+        self._status_dirty = False
+        # True mientras hay un envío de msg_status programado en el loop
+        self._status_update_scheduled = False
+        
+        # Contenido ya construido, reutilizado al volver a la vista
+        self._container = None
+        
+        # Manejadores de eventos creados una sola vez (identidad estable)
+        self._cb_login = self._on_login_click
+        self._cb_register = self._on_register_click
+        self._cb_field_change = self._on_field_change
         
     def create(self) -> ft.Container:
         """
@@ -34,23 +94,29 @@ class LoginView:
         Returns:
             Container con la vista de login
         """
+        # Reutilizar la vista construida: solo se reinicia el formulario. Los
+        # valores se envían al cliente cuando la página vuelve a añadirla.
+        if self._container is not None:
+            self._reset_fields()
+            return self._container
+        
         # Campos de entrada
         self.txt_correo = ft.TextField(
             label="Correo electrónico",
             width=300,
-            prefix_icon=ft.Icons.EMAIL,
-            keyboard_type=ft.KeyboardType.EMAIL,
-            on_change=self._on_field_change
+            prefix_icon=_ICON_EMAIL,
+            keyboard_type=_KB_EMAIL,
+            on_change=self._cb_field_change
         )
         
         self.txt_clave = ft.TextField(
             label="Contraseña",
             width=300,
-            prefix_icon=ft.Icons.LOCK,
+            prefix_icon=_ICON_LOCK,
             password=True,
             can_reveal_password=True,
-            on_change=self._on_field_change,
-            on_submit=self._on_login_click
+            on_change=self._cb_field_change,
+            on_submit=self._cb_login
         )
         
         # Mensaje de estado
@@ -58,63 +124,85 @@ class LoginView:
             "",
             color="red",
             size=14,
-            text_align=ft.TextAlign.CENTER,
+            text_align=_TA_CENTER,
             width=300
         )
         
+        # Botón de login (se deshabilita mientras se procesa el intento)
+        self.btn_login = ft.ElevatedButton(
+            "Iniciar Sesión",
+            on_click=self._cb_login,
+            bgcolor="blue",
+            color="white",
+            width=300,
+            height=45
+        )
+        
         # Contenido principal
-        return ft.Container(
+        self._container = ft.Container(
             content=ft.Column([
-                ft.Text("🏢", size=60),
-                ft.Text("Tours App", size=28, weight=ft.FontWeight.BOLD),
-                ft.Text("Iniciar Sesión", size=18, color="grey"),
-                ft.Divider(height=30),
+                *_build_header(),
                 
                 self.txt_correo,
                 self.txt_clave,
                 
-                ft.Container(height=20),
-                self.msg_status,
-                ft.Container(height=20),
-                
-                ft.ElevatedButton(
-                    "Iniciar Sesión",
-                    on_click=self._on_login_click,
-                    bgcolor="blue",
-                    color="white",
-                    width=300,
-                    height=45
+                # El margen reemplaza a los espaciadores alrededor del mensaje
+                ft.Container(
+                    content=self.msg_status,
+                    margin=ft.margin.symmetric(vertical=20)
                 ),
                 
-                ft.Container(height=20),
+                self.btn_login,
                 
                 ft.Row([
                     ft.Text("¿No tienes cuenta?"),
                     ft.TextButton(
                         "Registrarse",
-                        on_click=self._on_register_click
+                        on_click=self._cb_register
                     )
-                ], alignment=ft.MainAxisAlignment.CENTER)
+                ], alignment=_MA_CENTER)
             ],
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            horizontal_alignment=_CA_CENTER,
             spacing=15
             ),
             padding=40,
             border_radius=15,
             bgcolor="white",
-            shadow=ft.BoxShadow(
-                spread_radius=2,
-                blur_radius=20,
-                color="grey400",
-            )
+            shadow=_LOGIN_SHADOW
         )
+        return self._container
     
     def _on_login_click(self, e):
         """Maneja el click del botón de login"""
-        correo = self.txt_correo.value if self.txt_correo.value else ""
-        clave = self.txt_clave.value if self.txt_clave.value else ""
+        # Ignorar envíos repetidos mientras el anterior sigue en curso
+        if self._loading:
+            return
+        
+        correo = self._field(self.txt_correo)
+        clave = self._field(self.txt_clave)
         
-        self.on_login(correo, clave)
+        self.set_loading_state(True)
+        e.page.run_task(self._dispatch_login, correo, clave)
+    
+    async def _dispatch_login(self, correo: str, clave: str):
+        """
+        Ejecuta el callback de login sin bloquear la interfaz
+        
+        Los callbacks asíncronos se esperan en el loop de la página y los
+        síncronos se ejecutan en el executor por defecto; al terminar se
+        restablece el estado de carga.
+        
+        Args:
+            correo: Correo electrónico ingresado
+            clave: Contraseña ingresada
+        """
+        try:
+            if asyncio.iscoroutinefunction(self.on_login):
+                await self.on_login(correo, clave)
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, self.on_login, correo, clave)
+        finally:
+            self.set_loading_state(False)
     
     def _on_register_click(self, e):
         """Maneja el click del botón de ir a registro"""
@@ -122,10 +210,43 @@ class LoginView:
     
     def _on_field_change(self, e):
         """Maneja cambios en los campos para limpiar mensajes"""
-        if self.msg_status and self.msg_status.value:
-            self.msg_status.value = ""
+        # Sin mensaje visible no hay nada que limpiar ni enviar al cliente
+        if not self._status_dirty:
+            return
+        self._schedule_clear()
+    
+    def _schedule_clear(self):
+        """
+        Programa la limpieza del mensaje tras un cambio en los campos
+        
+        La limpieza se agrupa: una ráfaga de pulsaciones produce un único
+        update() del mensaje, _CLEAR_DEBOUNCE_SECONDS después de la última.
+        """
+        self._cancel_pending_clear()
+        page = mounted_page(self._container)
+        if page is not None:
+            self._clear_task = page.run_task(self._deferred_clear, _CLEAR_DEBOUNCE_SECONDS)
+    
+    async def _deferred_clear(self, delay: float):
+        """
+        Limpia el mensaje de estado tras una espera
+        
+        Args:
+            delay: Segundos a esperar antes de limpiar
+        """
+        await asyncio.sleep(delay)
+        self._clear_task = None
+        self._status_dirty = False
+        self.msg_status.value = ""
+        if mounted_page(self._container) is not None:
             self.msg_status.update()
     
+    def _cancel_pending_clear(self):
+        """Cancela la limpieza diferida pendiente, si existe"""
+        if self._clear_task is not None:
+            self._clear_task.cancel()
+            self._clear_task = None
+    
     def show_message(self, message: str, color: str = "red"):
         """
         Muestra un mensaje en la vista
@@ -135,23 +256,53 @@ class LoginView:
             color: Color del mensaje
         """
         if self.msg_status:
+            # Un mensaje nuevo no debe borrarse por una limpieza ya programada
+            self._cancel_pending_clear()
             self.msg_status.value = message
             self.msg_status.color = color
+            self._status_dirty = bool(message)
+            self._schedule_status_update()
+    
+    def _schedule_status_update(self):
+        """
+        Programa un único msg_status.update() para el siguiente ciclo del loop
+        
+        Varios show_message seguidos (p. ej. "cargando" y luego el resultado)
+        se envían al cliente en una sola actualización con el último valor.
+        """
+        page = mounted_page(self._container)
+        if page is None or self._status_update_scheduled:
+            return
+        self._status_update_scheduled = True
+        page.run_task(self._flush_status)
+    
+    async def _flush_status(self):
+        """Envía al cliente el mensaje de estado pendiente"""
+        self._status_update_scheduled = False
+        if mounted_page(self._container) is not None:
             self.msg_status.update()
     
     def clear_fields(self):
         """Limpia los campos del formulario"""
+        self._reset_fields()
+        
+        # Un único mensaje al cliente con los tres controles modificados
+        page = mounted_page(self._container)
+        if page is not None:
+            page.update(self.txt_correo, self.txt_clave, self.msg_status)
+    
+    def _reset_fields(self):
+        """Vacía los campos y el mensaje de estado sin enviar actualizaciones"""
         if self.txt_correo:
             self.txt_correo.value = ""
-            self.txt_correo.update()
         
         if self.txt_clave:
             self.txt_clave.value = ""
-            self.txt_clave.update()
         
         if self.msg_status:
+            self._cancel_pending_clear()
+            self._status_dirty = False
             self.msg_status.value = ""
-            self.msg_status.update()
     
     def get_data(self) -> dict:
         """
@@ -161,10 +312,23 @@ class LoginView:
             Dict con los datos del formulario
         """
         return {
-            "correo": self.txt_correo.value if self.txt_correo.value else "",
-            "clave": self.txt_clave.value if self.txt_clave.value else ""
+            "correo": self._field(self.txt_correo),
+            "clave": self._field(self.txt_clave)
         }
     
+    @staticmethod
+    def _field(ctrl) -> str:
+        """
+        Obtiene el valor de un campo de texto
+        
+        Args:
+            ctrl: TextField a leer (puede ser None si la vista no se ha creado)
+            
+        Returns:
+            Valor del campo o cadena vacía
+        """
+        return (ctrl.value or "") if ctrl else ""
+    
     def set_focus_email(self):
         """Establece el foco en el campo de correo"""
         if self.txt_correo:
@@ -177,5 +341,13 @@ class LoginView:
         Args:
             is_loading: True si está cargando
         """
-        # Esta función se puede expandir para deshabilitar campos durante la carga
-        pass
+        self._loading = is_loading
+        if not self.btn_login:
+            return
+        
+        for control in (self.txt_correo, self.txt_clave, self.btn_login):
+            control.disabled = is_loading
+        
+        page = mounted_page(self._container)
+        if page is not None:
+            page.update(self.txt_correo, self.txt_clave, self.btn_login)
@@ -2,10 +2,86 @@
 Vista de Paradas
 Maneja la interfaz de usuario para mostrar y gestionar paradas de una ruta
 """
+import asyncio
+import logging
+from contextlib import contextmanager
 import flet as ft
 from typing import Callable, Optional, List
 from models import User, Ruta, Parada
 
+logger = logging.getLogger(__name__)
+
+
+# Emojis para diferentes índices de tarjetas de parada
+_STOP_EMOJIS = ("🚏", "📍", "🏪", "🏛️", "🏞️", "🏢", "🎯", "⭐", "🔵", "🟢")
+
+# Estilos de los mensajes según su tipo: (color, bgcolor, emoji)
+_STYLE_BY_TYPE = {
+    "info": ("blue", "lightblue100", "ℹ️"),
+    "success": ("green", "lightgreen100", ""),
+    "warning": ("orange", "lightyellow100", "⚠️"),
+    "error": ("red", "lightred100", "❌")
+}
+
+# Virtualización de la lista de paradas: solo se construyen las tarjetas de la
+# ventana visible; el resto se reemplaza por espacios de altura estimada
+_STOPS_PAGE_SIZE = 20
+_ESTIMATED_CARD_HEIGHT = 130
+_SCROLL_LOAD_THRESHOLD = 300
+
+# Segundos que permanece visible un mensaje de éxito
+_AUTO_HIDE_SECONDS = 2
+
+# Estilo compartido de las tarjetas (objetos inmutables, se serializan en
+# cada actualización y pueden reutilizarse entre controles)
+_CARD_BORDER = ft.border.all(1, "grey300")
+_CARD_SHADOW = ft.BoxShadow(spread_radius=1, blur_radius=3, color="grey300")
+_DELETE_BORDER = ft.border.all(1, "red200")
+
+# Texto mostrado cuando una ruta o parada no tiene descripción
+_NO_DESCRIPTION = "Sin descripción"
+
+
+def _truncate(text: str, limit: int = 80) -> str:
+    """
+    Trunca un texto agregando "..." si supera el límite
+    
+    Args:
+        text: Texto a truncar
+        limit: Número máximo de caracteres
+        
+    Returns:
+        Texto truncado
+    """
+    # Sondear el carácter siguiente al límite evita calcular len() completo
+    return text[:limit] + "..." if text[limit:limit + 1] else text
+
+
+def _build_empty_stops_state() -> ft.Container:
+    """
+    Construye el contenido mostrado cuando la ruta no tiene paradas
+    
+    Returns:
+        Container con el mensaje de estado vacío
+    """
+    return ft.Container(
+        content=ft.Column([
+            ft.Text("🚏", size=80),
+            ft.Text("No hay paradas en esta ruta", size=18, weight=ft.FontWeight.BOLD, color="grey"),
+            ft.Text("¡Crea la primera parada para comenzar!", size=14, color="grey"),
+            ft.Container(height=15),
+            ft.Text("💡 Las paradas son los puntos de interés", size=12, color="grey"),
+            ft.Text("que visitarás en tu recorrido", size=12, color="grey"),
+        ], 
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=8),
+        padding=30,
+        border_radius=10,
+        bgcolor="grey50",
+        border=_CARD_BORDER,
+        alignment=ft.alignment.center
+    )
+
 
 class ParadasView:
     """
@@ -35,9 +111,43 @@ class ParadasView:
         self.user = None
         self.ruta = None
         self.paradas = []
+        # Copia inmutable de self.paradas que recorren los refrescos
+        self._paradas_snapshot = ()
         self.message_container = None
         self.stops_container = None
+        self._empty_stops_container = None
+        self._stops_list_view = None
+        self._stops_list_content = None
+        self._count_text = None
+        self._visible_count = _STOPS_PAGE_SIZE
+        # Tarjetas ya construidas por ID de parada: (card, emoji, nombre,
+        # descripción, botón de opciones, botón de conexiones); se
+        # reconcilian en lugar de reconstruirse en cada actualización
+        self._card_by_id = {}
+        # Espacios reservados reutilizables para las tarjetas fuera de la ventana
+        self._placeholders = []
+        # Nombres de parada normalizados para la verificación de duplicados
+        self._name_index = frozenset()
+        # Fechas de creación ya formateadas, por ID de parada
+        self._fecha_cache = {}
         self._page_ref = None
+        self._suspend_updates = 0
+        self._update_pending = False
+        self._hide_task = None
+        # Formulario compartido de creación (_active_parada None) y edición,
+        # construido en la primera apertura
+        self._active_parada: Optional[Parada] = None
+        self._stop_dialog = None
+        self._stop_dialog_title = None
+        self._stop_dialog_intro = None
+        self._stop_dialog_submit = None
+        self._nombre_field = None
+        self._descripcion_field = None
+        self._error_container = None
+        # Diálogo reutilizable de confirmación de eliminación
+        self._delete_dialog = None
+        self._delete_dialog_nombre = None
+        self._delete_dialog_desc = None
         
     def create(self, user: Optional[User] = None, ruta: Optional[Ruta] = None, paradas: List[Parada] = None) -> ft.Container:
         """
@@ -53,18 +163,46 @@ class ParadasView:
         """
         self.user = user
         self.ruta = ruta
-        self.paradas = paradas or []
+        self.paradas = list(paradas) if paradas else []
+        self._paradas_snapshot = tuple(self.paradas)
         
         # Información de la ruta
         ruta_nombre = ruta.nombre if ruta else "Ruta"
-        ruta_descripcion = ruta.descripcion if ruta and ruta.descripcion else "Sin descripción"
+        ruta_descripcion = ruta.descripcion if ruta and ruta.descripcion else _NO_DESCRIPTION
         
         # Crear contenedores que se actualizarán
         self.message_container = ft.Container()
-        self.stops_container = ft.Container()
-        
-        # Actualizar contenido de paradas
-        self._update_stops_content()
+        # Único contenedor con scroll: ocupa el alto restante de la vista
+        self.stops_container = ft.Container(expand=True)
+        self._visible_count = _STOPS_PAGE_SIZE
+        
+        # Lista persistente de tarjetas: se reconcilia en lugar de reconstruirse
+        self._card_by_id = {}
+        self._placeholders = []
+        self._count_text = ft.Text("", size=14, weight=ft.FontWeight.BOLD, color="grey")
+        self._stops_list_view = ft.ListView(
+            spacing=10,
+            padding=5,
+            auto_scroll=False,
+            expand=True,
+            on_scroll=self._on_stops_scroll
+        )
+        self._stops_list_content = ft.Column([
+            self._count_text,
+            ft.Container(height=10),
+            self._stops_list_view
+        ], 
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=5,
+        expand=True)
+        
+        # La lista de paradas (O(N) tarjetas) se construye tras el primer
+        # pintado; la cabecera y los botones se muestran de inmediato
+        if self._page_ref is not None:
+            self.stops_container.content = ft.ProgressRing()
+            self._schedule_refresh()
+        else:
+            self._refresh_stops()
         
         # Contenido principal
         return ft.Container(
@@ -139,7 +277,7 @@ class ParadasView:
             ],
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             spacing=10,
-            scroll=ft.ScrollMode.AUTO
+            expand=True
             ),
             padding=20,
             border_radius=15,
@@ -158,7 +296,7 @@ class ParadasView:
     
     def _on_visualize_route_click(self, e):
         """Maneja el click del botón visualizar ruta"""
-        if hasattr(self, 'on_visualize_route') and self.on_visualize_route:
+        if self.on_visualize_route:
             if self.ruta:
                 self.on_visualize_route(self.ruta)
             else:
@@ -168,20 +306,52 @@ class ParadasView:
     
     def _on_create_stop_click(self, e):
         """Maneja el click del botón crear parada"""
-        print("DEBUG: Botón 'Nueva Parada' clicado")
-        self._open_create_stop_form()
+        logger.debug("Botón 'Nueva Parada' clicado")
+        self._open_stop_form()
     
-    def _open_create_stop_form(self):
-        """Abre el formulario para crear nueva parada"""
+    def _open_stop_form(self, parada: Optional[Parada] = None):
+        """
+        Abre el formulario de paradas (el diálogo se construye una sola vez)
+        
+        Args:
+            parada: Parada a editar, o None para crear una nueva
+        """
+        if self._stop_dialog is None:
+            self._build_stop_dialog()
+        
+        # Configurar el formulario según el modo en cada apertura
+        self._active_parada = parada
+        if parada is None:
+            self._stop_dialog_title.value = "🚏 Crear Nueva Parada"
+            self._stop_dialog_intro.value = "Complete los datos:"
+            self._stop_dialog_submit.text = "Crear Parada"
+            self._stop_dialog_submit.bgcolor = "green"
+            self._nombre_field.value = ""
+            self._descripcion_field.value = ""
+        else:
+            self._stop_dialog_title.value = "✏️ Editar Parada"
+            self._stop_dialog_intro.value = "Modifica los datos de la parada:"
+            self._stop_dialog_submit.text = "Guardar Cambios"
+            self._stop_dialog_submit.bgcolor = "blue"
+            self._nombre_field.value = parada.nombre
+            self._descripcion_field.value = parada.descripcion or ""
+        self._error_container.content = None
+        
+        self._page_ref.open(self._stop_dialog)
+    
+    def _build_stop_dialog(self):
+        """Construye el diálogo reutilizable para crear y editar paradas"""
+        self._stop_dialog_title = ft.Text()
+        self._stop_dialog_intro = ft.Text(size=14)
         
         # Crear campos del formulario
-        nombre_field = ft.TextField(
+        self._nombre_field = ft.TextField(
             label="Nombre de la parada", 
             hint_text="Ej: Plaza Central",
             width=300
         )
         
-        descripcion_field = ft.TextField(
+        self._descripcion_field = ft.TextField(
             label="Descripción (opcional)", 
             multiline=True, 
             max_lines=2,
@@ -189,82 +359,104 @@ class ParadasView:
         )
         
         # Contenedor para mensajes de error
-        error_container = ft.Container()
-        
-        def show_error(message):
-            """Muestra un mensaje de error en el formulario"""
-            error_container.content = ft.Container(
-                content=ft.Text(
-                    message, 
-                    color="red", 
-                    size=12,
-                    text_align=ft.TextAlign.CENTER
-                ),
-                padding=5,
-                border_radius=5,
-                bgcolor="red100",
-                border=ft.border.all(1, "red")
-            )
-            self._page_ref.update()
-        
-        def clear_error():
-            """Limpia el mensaje de error"""
-            error_container.content = None
-            self._page_ref.update()
+        self._error_container = ft.Container()
         
-        def handle_close(e):
-            if e.control.text == "Crear Parada":
-                # Limpiar errores previos
-                clear_error()
-                
-                # Validar nombre
-                nombre = nombre_field.value
-                if not nombre or not nombre.strip():
-                    show_error("❌ El nombre de la parada es obligatorio")
-                    return
-                
-                # Verificar duplicados
-                if self._check_stop_name_exists(nombre.strip()):
-                    show_error("❌ Ya existe una parada con ese nombre en esta ruta")
-                    return
-                
-                # Procesar descripción
-                descripcion = descripcion_field.value
-                descripcion_final = None
-                if descripcion and descripcion.strip():
-                    descripcion_final = descripcion.strip()
-                
-                # Cerrar diálogo y crear parada
-                dlg.open = False
-                self._page_ref.update()
-                
-                print(f"Creando parada: {nombre.strip()}, Descripción: {descripcion_final}")
-                if self.on_create_stop and self.ruta:
-                    self.on_create_stop(self.ruta.id, nombre.strip(), descripcion_final)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
+        self._stop_dialog_submit = ft.ElevatedButton(on_click=self._on_stop_dialog_action, color="white")
         
-        dlg = ft.AlertDialog(
+        self._stop_dialog = ft.AlertDialog(
             modal=True,
-            title=ft.Text("🚏 Crear Nueva Parada"),
+            title=self._stop_dialog_title,
             content=ft.Column([
-                ft.Text("Complete los datos:", size=14),
+                self._stop_dialog_intro,
                 ft.Container(height=10),
-                nombre_field,
+                self._nombre_field,
                 ft.Container(height=10),
-                descripcion_field,
+                self._descripcion_field,
                 ft.Container(height=15),
-                error_container,  # Contenedor para errores
+                self._error_container,  # Contenedor para errores
             ], tight=True, height=280),
             actions=[
-                ft.TextButton("Cancelar", on_click=handle_close),
-                ft.ElevatedButton("Crear Parada", on_click=handle_close, bgcolor="green", color="white"),
+                ft.TextButton("Cancelar", on_click=self._on_stop_dialog_action),
+                self._stop_dialog_submit,
             ],
         )
+    
+    def _on_stop_dialog_action(self, e):
+        """Maneja los botones del formulario de creación/edición de paradas"""
+        dlg = self._stop_dialog
+        error_container = self._error_container
+        parada = self._active_parada
+        
+        if e.control is not self._stop_dialog_submit:
+            # Cancelar
+            dlg.open = False
+            self._update_now()
+            return
         
-        self._page_ref.open(dlg)
+        # Todas las mutaciones del formulario se envían en un único update()
+        with self._batch():
+            # Limpiar errores previos
+            self._clear_form_error(error_container)
+            
+            # Validar nombre (se normaliza una sola vez)
+            nombre_nuevo = (self._nombre_field.value or "").strip()
+            if not nombre_nuevo:
+                self._show_form_error(error_container, "❌ El nombre de la parada es obligatorio")
+                return
+            
+            # Verificar duplicados (al editar, solo si el nombre cambió)
+            nombre_cambio = parada is None or nombre_nuevo.casefold() != parada.nombre.strip().casefold()
+            if nombre_cambio and self._check_stop_name_exists(nombre_nuevo):
+                self._show_form_error(error_container, "❌ Ya existe una parada con ese nombre en esta ruta")
+                return
+            
+            # Procesar descripción
+            descripcion_final = (self._descripcion_field.value or "").strip() or None
+            
+            # Cerrar diálogo
+            dlg.open = False
+        
+        # Crear o editar la parada una vez enviado el cierre del diálogo
+        if parada is None:
+            logger.debug("Creando parada: %s, Descripción: %s", nombre_nuevo, descripcion_final)
+            if self.on_create_stop and self.ruta:
+                self.on_create_stop(self.ruta.id, nombre_nuevo, descripcion_final)
+        else:
+            logger.debug("Editando parada ID %s: %s, Descripción: %s", parada.id, nombre_nuevo, descripcion_final)
+            if self.on_edit_stop and self.ruta:
+                self.on_edit_stop(parada.id, self.ruta.id, nombre_nuevo, descripcion_final)
+    
+    def _show_form_error(self, error_container: ft.Container, message: str):
+        """
+        Muestra un mensaje de error en un formulario
+        
+        Args:
+            error_container: Contenedor de errores del formulario
+            message: Mensaje a mostrar
+        """
+        error_container.content = ft.Container(
+            content=ft.Text(
+                message, 
+                color="red", 
+                size=12,
+                text_align=ft.TextAlign.CENTER
+            ),
+            padding=5,
+            border_radius=5,
+            bgcolor="red100",
+            border=ft.border.all(1, "red")
+        )
+        self._update_now()
+    
+    def _clear_form_error(self, error_container: ft.Container):
+        """
+        Limpia el mensaje de error de un formulario
+        
+        Args:
+            error_container: Contenedor de errores del formulario
+        """
+        error_container.content = None
+        self._update_now()
     
     def _check_stop_name_exists(self, nombre: str) -> bool:
         """
@@ -276,52 +468,92 @@ class ParadasView:
         Returns:
             True si existe, False si no existe
         """
-        try:
-            # Obtener todas las paradas de la ruta
-            for parada in self.paradas:
-                if parada.nombre.lower().strip() == nombre.lower().strip():
-                    return True
-            return False
-        except Exception as e:
-            print(f"Error al verificar nombre de parada: {e}")
-            return False
+        return nombre.strip().casefold() in self._name_index
     
     def _update_stops_content(self):
         """Actualiza el contenido del contenedor de paradas"""
-        if not self.paradas:
-            # Mostrar mensaje cuando no hay paradas
-            self.stops_container.content = ft.Container(
-                content=ft.Column([
-                    ft.Text("🚏", size=80),
-                    ft.Text("No hay paradas en esta ruta", size=18, weight=ft.FontWeight.BOLD, color="grey"),
-                    ft.Text("¡Crea la primera parada para comenzar!", size=14, color="grey"),
-                    ft.Container(height=15),
-                    ft.Text("💡 Las paradas son los puntos de interés", size=12, color="grey"),
-                    ft.Text("que visitarás en tu recorrido", size=12, color="grey"),
-                ], 
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=8),
-                padding=30,
-                border_radius=10,
-                bgcolor="grey50",
-                border=ft.border.all(1, "grey300"),
-                alignment=ft.alignment.center
-            )
+        self._name_index = frozenset(p.nombre.strip().casefold() for p in self._paradas_snapshot if p.nombre)
+        if not self._paradas_snapshot:
+            # Mostrar mensaje cuando no hay paradas (se construye una sola vez
+            # y se reutiliza en los siguientes refrescos, su contenido es fijo)
+            if self._empty_stops_container is None:
+                self._empty_stops_container = _build_empty_stops_state()
+            self.stops_container.content = self._empty_stops_container
         else:
-            # Mostrar lista de paradas
+            # Descartar las tarjetas de paradas eliminadas
+            current_ids = {parada.id for parada in self._paradas_snapshot}
+            for stop_id in list(self._card_by_id):
+                if stop_id not in current_ids:
+                    del self._card_by_id[stop_id]
+            
+            # Mostrar lista de paradas: solo se materializan las tarjetas de la
+            # ventana visible, el resto son espacios reservados reutilizados
+            visible_end = self._visible_count
+            placeholders = self._placeholders
             stops_list = []
+            for i, parada in enumerate(self._paradas_snapshot):
+                if i < visible_end:
+                    stops_list.append(self._get_stop_card(parada, i))
+                else:
+                    j = i - visible_end
+                    if j == len(placeholders):
+                        placeholders.append(self._create_stop_placeholder())
+                    stops_list.append(placeholders[j])
             
-            for i, parada in enumerate(self.paradas):
-                stop_card = self._create_stop_card(parada, i)
-                stops_list.append(stop_card)
+            self._count_text.value = f"📋 Total de paradas: {len(self._paradas_snapshot)}"
+            self._stops_list_view.controls = stops_list
+            self.stops_container.content = self._stops_list_content
+    
+    def _on_stops_scroll(self, e):
+        """
+        Amplía la ventana de tarjetas materializadas al acercarse al final de la lista
+        
+        Args:
+            e: Evento de scroll del ListView
+        """
+        if self._visible_count >= len(self._paradas_snapshot):
+            return
+        if e.pixels < e.max_scroll_extent - _SCROLL_LOAD_THRESHOLD:
+            return
+        
+        start = self._visible_count
+        self._visible_count = min(start + _STOPS_PAGE_SIZE, len(self._paradas_snapshot))
+        controls = self._stops_list_view.controls
+        for i in range(start, self._visible_count):
+            controls[i] = self._get_stop_card(self._paradas_snapshot[i], i)
+        self._stops_list_view.update()
+    
+    @staticmethod
+    def _create_stop_placeholder() -> ft.Container:
+        """Crea un espacio reservado con la altura estimada de una tarjeta"""
+        return ft.Container(height=_ESTIMATED_CARD_HEIGHT)
+    
+    def _get_stop_card(self, parada: Parada, index: int) -> ft.Container:
+        """
+        Obtiene la tarjeta de una parada, reutilizando la ya construida
+        
+        Solo se actualizan en su lugar los textos y datos que pueden cambiar
+        (emoji por posición, nombre, descripción y la parada de los botones);
+        Flet envía únicamente los valores que realmente cambiaron.
+        
+        Args:
+            parada: Objeto Parada
+            index: Índice en la lista
             
-            self.stops_container.content = ft.Column([
-                ft.Text(f"📋 Total de paradas: {len(self.paradas)}", size=14, weight=ft.FontWeight.BOLD, color="grey"),
-                ft.Container(height=10),
-                ft.Column(stops_list, spacing=10)
-            ], 
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=5)
+        Returns:
+            Container con la tarjeta de la parada
+        """
+        entry = self._card_by_id.get(parada.id)
+        if entry is None:
+            return self._create_stop_card(parada, index)
+        
+        card, emoji_text, nombre_text, descripcion_text, options_button, connections_button = entry
+        emoji_text.value = _STOP_EMOJIS[index % len(_STOP_EMOJIS)]
+        nombre_text.value = parada.nombre
+        descripcion_text.value = _truncate(parada.descripcion) if parada.descripcion else _NO_DESCRIPTION
+        options_button.data = parada
+        connections_button.data = parada
+        return card
     
     def _create_stop_card(self, parada: Parada, index: int) -> ft.Container:
         """
@@ -334,66 +566,82 @@ class ParadasView:
         Returns:
             Container con la tarjeta de la parada
         """
-        # Emojis para diferentes índices
-        emojis = ["🚏", "📍", "🏪", "🏛️", "🏞️", "🏢", "🎯", "⭐", "🔵", "🟢"]
-        emoji = emojis[index % len(emojis)]
+        emoji = _STOP_EMOJIS[index % len(_STOP_EMOJIS)]
         
         # Descripción truncada
-        descripcion_text = parada.descripcion if parada.descripcion else "Sin descripción"
-        if len(descripcion_text) > 80:
-            descripcion_text = descripcion_text[:80] + "..."
-        
-        # Fecha de creación
-        fecha_text = "Fecha no disponible"
-        if parada.created_at:
-            try:
-                fecha_text = parada.created_at.strftime("%d/%m/%Y")
-            except:
-                fecha_text = str(parada.created_at)
+        descripcion_text = _truncate(parada.descripcion) if parada.descripcion else _NO_DESCRIPTION
+        
+        # Fecha de creación (se formatea una sola vez por parada)
+        fecha_text = self._fecha_cache.get(parada.id)
+        if fecha_text is None:
+            fecha_text = "Fecha no disponible"
+            if parada.created_at:
+                try:
+                    fecha_text = parada.created_at.strftime("%d/%m/%Y")
+                except:
+                    fecha_text = str(parada.created_at)
+            self._fecha_cache[parada.id] = fecha_text
+        
+        # Controles que _get_stop_card actualiza en su lugar
+        emoji_control = ft.Text(emoji, size=24)
+        nombre_control = ft.Text(parada.nombre, size=16, weight=ft.FontWeight.BOLD)
+        descripcion_control = ft.Text(descripcion_text, size=12, color="grey700")
+        options_button = ft.IconButton(
+            icon=ft.Icons.MORE_VERT,
+            icon_size=20,
+            tooltip="Opciones",
+            data=parada,
+            on_click=self._options_handler
+        )
+        connections_button = ft.TextButton(
+            content=ft.Row([
+                ft.Text("🔗", size=12),
+                ft.Text("Conexiones", size=10),
+            ], spacing=3),
+            data=parada,
+            on_click=self._connections_handler
+        )
         
-        return ft.Container(
+        card = ft.Container(
             content=ft.Column([
                 # Encabezado de la tarjeta
                 ft.Row([
-                    ft.Text(emoji, size=24),
+                    emoji_control,
                     ft.Column([
-                        ft.Text(parada.nombre, size=16, weight=ft.FontWeight.BOLD),
+                        nombre_control,
                         ft.Text(f"ID: {parada.id}", size=10, color="grey"),
                     ], spacing=2, expand=True),
-                    ft.IconButton(
-                        icon=ft.Icons.MORE_VERT,
-                        icon_size=20,
-                        tooltip="Opciones",
-                        on_click=lambda e, stop=parada: self._show_stop_options(stop)
-                    )
+                    options_button
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 
                 # Descripción
-                ft.Text(descripcion_text, size=12, color="grey700"),
+                descripcion_control,
                 
                 # Footer con fecha
                 ft.Row([
                     ft.Text(f"📅 {fecha_text}", size=10, color="grey"),
-                    ft.TextButton(
-                        content=ft.Row([
-                            ft.Text("🔗", size=12),
-                            ft.Text("Conexiones", size=10),
-                        ], spacing=3),
-                        on_click=lambda e, stop=parada: self._on_view_connections_click(stop)
-                    )
+                    connections_button
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
             ], spacing=8),
             padding=15,
             border_radius=8,
             bgcolor="white",
-            border=ft.border.all(1, "grey300"),
-            shadow=ft.BoxShadow(
-                spread_radius=1,
-                blur_radius=3,
-                color="grey300",
-            ),
+            border=_CARD_BORDER,
+            shadow=_CARD_SHADOW,
             width=500
         )
+        self._card_by_id[parada.id] = (
+            card, emoji_control, nombre_control, descripcion_control, options_button, connections_button
+        )
+        return card
+    
+    def _options_handler(self, e):
+        """Abre las opciones de la parada guardada en el botón pulsado"""
+        self._show_stop_options(e.control.data)
+    
+    def _connections_handler(self, e):
+        """Abre las conexiones de la parada guardada en el botón pulsado"""
+        self._on_view_connections_click(e.control.data)
     
     def _show_stop_options(self, parada: Parada):
         """
@@ -402,26 +650,16 @@ class ParadasView:
         Args:
             parada: La parada seleccionada
         """
-        def handle_option(e):
-            dlg.open = False
-            self._page_ref.update()
-            
-            # Identificar la opción por el texto del ListTile
-            if hasattr(e.control, 'title') and hasattr(e.control.title, 'value'):
-                option_text = e.control.title.value
-                if option_text == "Editar parada":
-                    self._edit_stop(parada)
-                elif option_text == "Eliminar parada":
-                    self._confirm_delete_stop(parada)
-        
+        # Enviar el cierre antes de abrir el siguiente diálogo: si este ya
+        # está construido, page.open() no vuelve a enviar el de opciones
         def handle_edit(e):
             dlg.open = False
-            self._page_ref.update()
-            self._edit_stop(parada)
+            self._update_now()
+            self._open_stop_form(parada)
             
         def handle_delete(e):
             dlg.open = False
-            self._page_ref.update()
+            self._update_now()
             self._confirm_delete_stop(parada)
         
         dlg = ft.AlertDialog(
@@ -446,109 +684,6 @@ class ParadasView:
         
         self._page_ref.open(dlg)
     
-    def _edit_stop(self, parada: Parada):
-        """
-        Abre el formulario de edición para una parada existente
-        
-        Args:
-            parada: La parada a editar
-        """
-        # Crear campos del formulario pre-llenados
-        nombre_field = ft.TextField(
-            label="Nombre de la parada", 
-            hint_text="Ej: Plaza Central",
-            width=300,
-            value=parada.nombre
-        )
-        
-        descripcion_field = ft.TextField(
-            label="Descripción (opcional)", 
-            multiline=True, 
-            max_lines=2,
-            width=300,
-            value=parada.descripcion or ""
-        )
-        
-        # Contenedor para mensajes de error
-        error_container = ft.Container()
-        
-        def show_error(message):
-            """Muestra un mensaje de error en el formulario"""
-            error_container.content = ft.Container(
-                content=ft.Text(
-                    message, 
-                    color="red", 
-                    size=12,
-                    text_align=ft.TextAlign.CENTER
-                ),
-                padding=5,
-                border_radius=5,
-                bgcolor="red100",
-                border=ft.border.all(1, "red")
-            )
-            self._page_ref.update()
-        
-        def clear_error():
-            """Limpia el mensaje de error"""
-            error_container.content = None
-            self._page_ref.update()
-        
-        def handle_close(e):
-            if e.control.text == "Guardar Cambios":
-                # Limpiar errores previos
-                clear_error()
-                
-                # Validar nombre
-                nombre = nombre_field.value
-                if not nombre or not nombre.strip():
-                    show_error("❌ El nombre de la parada es obligatorio")
-                    return
-                
-                # Verificar duplicados (solo si el nombre cambió)
-                nombre_nuevo = nombre.strip()
-                if nombre_nuevo.lower() != parada.nombre.lower():
-                    if self._check_stop_name_exists(nombre_nuevo):
-                        show_error("❌ Ya existe una parada con ese nombre en esta ruta")
-                        return
-                
-                # Procesar descripción
-                descripcion = descripcion_field.value
-                descripcion_final = None
-                if descripcion and descripcion.strip():
-                    descripcion_final = descripcion.strip()
-                
-                # Cerrar diálogo y editar parada
-                dlg.open = False
-                self._page_ref.update()
-                
-                print(f"Editando parada ID {parada.id}: {nombre_nuevo}, Descripción: {descripcion_final}")
-                if self.on_edit_stop and self.ruta:
-                    self.on_edit_stop(parada.id, self.ruta.id, nombre_nuevo, descripcion_final)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
-        
-        dlg = ft.AlertDialog(
-            modal=True,
-            title=ft.Text("✏️ Editar Parada"),
-            content=ft.Column([
-                ft.Text("Modifica los datos de la parada:", size=14),
-                ft.Container(height=10),
-                nombre_field,
-                ft.Container(height=10),
-                descripcion_field,
-                ft.Container(height=15),
-                error_container,  # Contenedor para errores
-            ], tight=True, height=280),
-            actions=[
-                ft.TextButton("Cancelar", on_click=handle_close),
-                ft.ElevatedButton("Guardar Cambios", on_click=handle_close, bgcolor="blue", color="white"),
-            ],
-        )
-        
-        self._page_ref.open(dlg)
-    
     def _confirm_delete_stop(self, parada: Parada):
         """
         Muestra el modal de confirmación para eliminar una parada
@@ -556,20 +691,21 @@ class ParadasView:
         Args:
             parada: La parada a eliminar
         """
-        def handle_delete(e):
-            if e.control.text == "Sí, eliminar":
-                dlg.open = False
-                self._page_ref.update()
-                
-                print(f"Eliminando parada ID {parada.id}: {parada.nombre}")
-                if self.on_delete_stop and self.ruta:
-                    self.on_delete_stop(parada.id, self.ruta.id, parada.nombre)
-            else:
-                # Cancelar
-                dlg.open = False
-                self._page_ref.update()
+        if self._delete_dialog is None:
+            self._build_delete_dialog()
         
-        dlg = ft.AlertDialog(
+        self._active_parada = parada
+        self._delete_dialog_nombre.value = parada.nombre
+        self._delete_dialog_desc.value = parada.descripcion or _NO_DESCRIPTION
+        
+        self._page_ref.open(self._delete_dialog)
+    
+    def _build_delete_dialog(self):
+        """Construye el diálogo reutilizable de confirmación de eliminación"""
+        self._delete_dialog_nombre = ft.Text(size=16, weight=ft.FontWeight.BOLD)
+        self._delete_dialog_desc = ft.Text(size=12, color="grey")
+        
+        self._delete_dialog = ft.AlertDialog(
             modal=True,
             title=ft.Text("⚠️ Confirmar Eliminación"),
             content=ft.Column([
@@ -579,30 +715,60 @@ class ParadasView:
                     content=ft.Column([
                         ft.Row([
                             ft.Text("🚏", size=16),
-                            ft.Text(parada.nombre, size=16, weight=ft.FontWeight.BOLD),
+                            self._delete_dialog_nombre,
                         ], spacing=8),
-                        ft.Text(parada.descripcion or "Sin descripción", size=12, color="grey"),
+                        self._delete_dialog_desc,
                     ], spacing=5),
                     padding=10,
                     border_radius=5,
                     bgcolor="red50",
-                    border=ft.border.all(1, "red200")
+                    border=_DELETE_BORDER
                 ),
                 ft.Container(height=15),
                 ft.Text("⚠️ Esta acción no se puede deshacer", size=12, color="red", weight=ft.FontWeight.BOLD),
             ], tight=True),
             actions=[
-                ft.TextButton("Cancelar", on_click=handle_delete),
-                ft.ElevatedButton("Sí, eliminar", on_click=handle_delete, bgcolor="red", color="white"),
+                ft.TextButton("Cancelar", on_click=self._on_delete_dialog_action),
+                ft.ElevatedButton("Sí, eliminar", on_click=self._on_delete_dialog_action, bgcolor="red", color="white"),
             ],
         )
+    
+    def _on_delete_dialog_action(self, e):
+        """Maneja los botones del diálogo de confirmación de eliminación"""
+        parada = self._active_parada
         
-        self._page_ref.open(dlg)
+        self._delete_dialog.open = False
+        self._update_now()
+        
+        if e.control.text == "Sí, eliminar":
+            logger.debug("Eliminando parada ID %s: %s", parada.id, parada.nombre)
+            if self.on_delete_stop and self.ruta:
+                self.on_delete_stop(parada.id, self.ruta.id, parada.nombre)
     
     def _close_dialog(self, dialog):
         """Cierra un diálogo"""
         dialog.open = False
-        self._page_ref.update()
+        self._update_now()
+    
+    @contextmanager
+    def _batch(self):
+        """
+        Agrupa las mutaciones del bloque en un único page.update() al salir
+        
+        Los bloques pueden anidarse; solo el más externo envía la actualización.
+        """
+        self._suspend_updates += 1
+        try:
+            yield
+        finally:
+            self._suspend_updates -= 1
+            if self._suspend_updates == 0:
+                self._update_now()
+    
+    def _update_now(self):
+        """Envía las mutaciones al cliente, salvo dentro de un bloque _batch()"""
+        if self._suspend_updates == 0 and self._page_ref is not None:
+            self._page_ref.update()
     
     def update_stops(self, paradas: List[Parada]):
         """
@@ -611,10 +777,43 @@ class ParadasView:
         Args:
             paradas: Nueva lista de paradas
         """
-        self.paradas = paradas
+        self.paradas = list(paradas) if paradas else []
+        self._paradas_snapshot = tuple(self.paradas)
+        
+        # Sin página no hay nada que pintar: reconstruir directamente
+        if self._page_ref is None:
+            self._refresh_stops()
+            return
+        
+        self._schedule_refresh()
+    
+    def _schedule_refresh(self):
+        """
+        Programa la reconstrucción de la lista para el siguiente ciclo del loop
+        
+        Varias llamadas seguidas se agrupan en una sola reconstrucción con la
+        última lista recibida.
+        """
+        if self._update_pending:
+            return
+        self._update_pending = True
+        self._page_ref.run_task(self._flush_update)
+    
+    async def _flush_update(self):
+        """Reconstruye la lista de paradas pendiente y la envía al cliente"""
+        self._update_pending = False
+        self._refresh_stops()
+        self._page_ref.update()
+    
+    def _refresh_stops(self):
+        """Reconstruye el contenido de paradas a partir de la copia de self.paradas"""
+        # Descartar las fechas de paradas que ya no están en la lista
+        current_ids = {parada.id for parada in self._paradas_snapshot}
+        for stop_id in list(self._fecha_cache):
+            if stop_id not in current_ids:
+                del self._fecha_cache[stop_id]
+        
         self._update_stops_content()
-        if self._page_ref:
-            self._page_ref.update()
     
     def show_message(self, message: str, message_type: str = "info"):
         """
@@ -624,31 +823,7 @@ class ParadasView:
             message: Mensaje a mostrar
             message_type: Tipo de mensaje (info, success, warning, error)
         """
-        color_map = {
-            "info": "blue",
-            "success": "green", 
-            "warning": "orange",
-            "error": "red"
-        }
-        
-        bgcolor_map = {
-            "info": "lightblue100",
-            "success": "lightgreen100", 
-            "warning": "lightyellow100",
-            "error": "lightred100"
-        }
-        
-        color = color_map.get(message_type, "blue")
-        bgcolor = bgcolor_map.get(message_type, "lightblue100")
-        
-        icon_map = {
-            "info": "ℹ️",
-            "success": "",
-            "warning": "⚠️",
-            "error": "❌"
-        }
-        
-        emoji = icon_map.get(message_type, "ℹ️")
+        color, bgcolor, emoji = _STYLE_BY_TYPE.get(message_type, _STYLE_BY_TYPE["info"])
         
         self.message_container.content = ft.Container(
             content=ft.Row([
@@ -664,18 +839,24 @@ class ParadasView:
         if self._page_ref:
             self._page_ref.update()
         
-        # Auto-ocultar mensajes de éxito después de 2 segundos
-        if message_type == "success":
-            import threading
-            import time
-            
-            def auto_hide():
-                time.sleep(2)
-                self.clear_message()
-            
-            thread = threading.Thread(target=auto_hide)
-            thread.daemon = True
-            thread.start()
+        # Auto-ocultar mensajes de éxito tras _AUTO_HIDE_SECONDS
+        # (un único temporizador: cada mensaje nuevo cancela el anterior)
+        if self._hide_task is not None:
+            self._hide_task.cancel()
+            self._hide_task = None
+        if message_type == "success" and self._page_ref is not None:
+            self._hide_task = self._page_ref.run_task(self._auto_hide, _AUTO_HIDE_SECONDS)
+    
+    async def _auto_hide(self, delay: float):
+        """
+        Oculta el mensaje actual tras una espera en el loop de la página
+        
+        Args:
+            delay: Segundos a esperar antes de ocultar el mensaje
+        """
+        await asyncio.sleep(delay)
+        self._hide_task = None
+        self.clear_message()
     
     def clear_message(self):
         """Limpia el mensaje mostrado"""
@@ -686,7 +867,7 @@ class ParadasView:
     def set_page_reference(self, page):
         """Establece referencia a la página para actualizaciones"""
         self._page_ref = page
-        print(f"DEBUG: Referencia de página establecida en ParadasView: {page is not None}")
+        logger.debug("Referencia de página establecida en ParadasView: %s", page is not None)
     
     def _on_view_connections_click(self, parada: Parada):
         """
@@ -695,6 +876,6 @@ class ParadasView:
         Args:
             parada: La parada seleccionada
         """
-        print(f"DEBUG: Ver conexiones clicado para parada: {parada.nombre}")
+        logger.debug("Ver conexiones clicado para parada: %s", parada.nombre)
         if self.on_view_connections:
             self.on_view_connections(parada)
@@ -2,8 +2,15 @@
 Vista de Registro
 Maneja la interfaz de usuario para el registro de nuevos usuarios
 """
+import asyncio
 import flet as ft
 from typing import Callable
+from core.config import AppConfig
+from views.view_utils import mounted_page
+
+
+# Espera tras la última pulsación antes de limpiar el mensaje de estado
+_CLEAR_DEBOUNCE_SECONDS = AppConfig.UI_CONFIG["status_clear_debounce"]
 
 
 class RegisterView:
@@ -28,6 +35,14 @@ class RegisterView:
         self.txt_clave = None
         self.msg_status = None
         
+        # True mientras msg_status muestra un mensaje (evita leer el control en cada tecla)
+        self._status_dirty = False
+        # Limpieza diferida del mensaje de estado mientras se escribe
+        self._clear_task = None
+        
+        # Contenido ya construido, reutilizado al volver a la vista
+        self._container = None
+        
     def create(self) -> ft.Container:
         """
         Crea y retorna el contenido de la vista de registro
@@ -35,6 +50,12 @@ class RegisterView:
         Returns:
             Container con la vista de registro
         """
+        # Reutilizar la vista construida: solo se reinicia el formulario. Los
+        # valores se envían al cliente cuando la página vuelve a añadirla.
+        if self._container is not None:
+            self._reset_fields()
+            return self._container
+        
         # Campos de entrada
         self.txt_nombre = ft.TextField(
             label="Nombre completo",
@@ -71,7 +92,7 @@ class RegisterView:
         )
         
         # Contenido principal
-        return ft.Container(
+        self._container = ft.Container(
             content=ft.Column([
                 ft.Text("👤", size=60),
                 ft.Text("Crear Cuenta", size=28, weight=ft.FontWeight.BOLD),
@@ -117,6 +138,16 @@ class RegisterView:
                 color="grey400",
             )
         )
+        return self._container
+    
+    def dispose(self):
+        """Descarta la vista construida para que el siguiente create() la reconstruya"""
+        self._reset_fields()
+        self._container = None
+        self.txt_nombre = None
+        self.txt_correo = None
+        self.txt_clave = None
+        self.msg_status = None
     
     def _on_register_click(self, e):
         """Maneja el click del botón de registro"""
@@ -132,10 +163,43 @@ class RegisterView:
     
     def _on_field_change(self, e):
         """Maneja cambios en los campos para limpiar mensajes"""
-        if self.msg_status and self.msg_status.value:
-            self.msg_status.value = ""
+        # Sin mensaje visible no hay nada que limpiar ni enviar al cliente
+        if not self._status_dirty:
+            return
+        self._schedule_clear()
+    
+    def _schedule_clear(self):
+        """
+        Programa la limpieza del mensaje tras un cambio en los campos
+        
+        La limpieza se agrupa: una ráfaga de pulsaciones produce un único
+        update() del mensaje, _CLEAR_DEBOUNCE_SECONDS después de la última.
+        """
+        self._cancel_pending_clear()
+        page = mounted_page(self._container)
+        if page is not None:
+            self._clear_task = page.run_task(self._deferred_clear, _CLEAR_DEBOUNCE_SECONDS)
+    
+    async def _deferred_clear(self, delay: float):
+        """
+        Limpia el mensaje de estado tras una espera
+        
+        Args:
+            delay: Segundos a esperar antes de limpiar
+        """
+        await asyncio.sleep(delay)
+        self._clear_task = None
+        self._status_dirty = False
+        self.msg_status.value = ""
+        if mounted_page(self._container) is not None:
             self.msg_status.update()
     
+    def _cancel_pending_clear(self):
+        """Cancela la limpieza diferida pendiente, si existe"""
+        if self._clear_task is not None:
+            self._clear_task.cancel()
+            self._clear_task = None
+    
     def show_message(self, message: str, color: str = "red"):
         """
         Muestra un mensaje en la vista
@@ -145,27 +209,38 @@ class RegisterView:
             color: Color del mensaje
         """
         if self.msg_status:
+            # Un mensaje nuevo no debe borrarse por una limpieza ya programada
+            self._cancel_pending_clear()
             self.msg_status.value = message
             self.msg_status.color = color
-            self.msg_status.update()
+            self._status_dirty = bool(message)
+            if mounted_page(self._container) is not None:
+                self.msg_status.update()
     
     def clear_fields(self):
         """Limpia los campos del formulario"""
+        self._reset_fields()
+        
+        # Un único mensaje al cliente con los cuatro controles modificados
+        page = mounted_page(self._container)
+        if page is not None:
+            page.update(self.txt_nombre, self.txt_correo, self.txt_clave, self.msg_status)
+    
+    def _reset_fields(self):
+        """Vacía los campos y el mensaje de estado sin enviar actualizaciones"""
         if self.txt_nombre:
             self.txt_nombre.value = ""
-            self.txt_nombre.update()
         
         if self.txt_correo:
             self.txt_correo.value = ""
-            self.txt_correo.update()
         
         if self.txt_clave:
             self.txt_clave.value = ""
-            self.txt_clave.update()
         
         if self.msg_status:
+            self._cancel_pending_clear()
+            self._status_dirty = False
             self.msg_status.value = ""
-            self.msg_status.update()
     
     def get_data(self) -> dict:
         """
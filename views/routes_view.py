@@ -7,6 +7,24 @@ from typing import Callable, List, Optional
 from models import User, Ruta
 
 
+# Emojis para diferentes índices de tarjetas de ruta
+_ROUTE_EMOJIS = ("🗺️", "📍", "🚩", "🏁", "⭐", "🎯", "📌", "🔵", "🟢", "🟡")
+
+# Estilos de los mensajes según su tipo: (color, bgcolor, emoji)
+_STYLE_BY_TYPE = {
+    "info": ("blue", "lightblue100", "ℹ️"),
+    "success": ("green", "lightgreen100", ""),
+    "warning": ("orange", "lightyellow100", "⚠️"),
+    "error": ("red", "lightred100", "❌")
+}
+
+# Virtualización de la lista de rutas: solo se construyen las tarjetas de la
+# ventana visible; el resto se reemplaza por espacios de altura estimada
+_ROUTES_PAGE_SIZE = 20
+_ESTIMATED_CARD_HEIGHT = 170
+_SCROLL_LOAD_THRESHOLD = 300
+
+
 class RoutesView:
     """
     Vista para gestionar rutas del usuario
@@ -24,8 +42,28 @@ class RoutesView:
         self.on_back_to_dashboard = on_back_to_dashboard
         self.user = None
         self.routes = []
+        # Rutas indexadas por ID para los botones de las tarjetas (data=ruta.id)
+        self._routes_by_id = {}
+        # Fechas de creación ya formateadas, por ID de ruta
+        self._fecha_cache = {}
+        # Huella de la última lista de rutas mostrada
+        self._routes_fingerprint = None
         self.message_container = None
         self.routes_container = None
+        self._routes_list_view = None
+        self._routes_list_content = None
+        self._count_text = None
+        self._visible_count = _ROUTES_PAGE_SIZE
+        # Tarjetas ya construidas por ID de ruta: (card, emoji, nombre,
+        # descripción); se reconcilian en lugar de reconstruirse
+        self._card_by_id = {}
+        # Espacios reservados reutilizables para las tarjetas fuera de la ventana
+        self._placeholders = []
+        
+        # Subárboles fijos de la vista, construidos en el primer create()
+        self._header = None
+        self._user_text = None
+        self._create_button = None
         
     def create(self, user: User, routes: List[Ruta]) -> ft.Container:
         """
@@ -43,10 +81,66 @@ class RoutesView:
         
         # Crear contenedores que se actualizarán
         self.message_container = ft.Container()
-        self.routes_container = ft.Container()
+        # Único contenedor con scroll: ocupa el alto restante de la vista
+        self.routes_container = ft.Container(expand=True)
+        self._visible_count = _ROUTES_PAGE_SIZE
+        
+        # Lista persistente de tarjetas: se reconcilia en lugar de reconstruirse
+        self._card_by_id = {}
+        self._placeholders = []
+        self._count_text = ft.Text("", size=16, weight=ft.FontWeight.BOLD)
+        self._routes_list_view = ft.ListView(
+            spacing=10,
+            padding=5,
+            auto_scroll=False,
+            expand=True,
+            on_scroll=self._on_routes_scroll
+        )
+        self._routes_list_content = ft.Column([
+            self._count_text,
+            ft.Container(height=10),
+            self._routes_list_view
+        ], 
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=10,
+        expand=True)
+        
+        # El encabezado y el botón de crear son fijos: se construyen una vez
+        # y en las siguientes visitas solo se actualiza el nombre del usuario
+        if self._header is None:
+            self._build_static_controls()
+        self._user_text.value = f"Usuario: {user.nombre}"
+        
+        # Actualizar contenido de rutas
+        self._update_routes_content()
         
+        # Contenido principal
+        return ft.Container(
+            content=ft.Column([
+                self._header,
+                self.message_container,
+                self._create_button,
+                self.routes_container,
+            ], 
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=15
+            ),
+            padding=40,
+            border_radius=15,
+            bgcolor="white",
+            shadow=ft.BoxShadow(
+                spread_radius=2,
+                blur_radius=20,
+                color="grey400",
+            ),
+            expand=True
+        )
+    
+    def _build_static_controls(self):
+        """Construye el encabezado y el botón de crear ruta reutilizables"""
         # Título y información del usuario
-        header = ft.Container(
+        self._user_text = ft.Text("", size=16, color="grey")
+        self._header = ft.Container(
             content=ft.Column([
                 ft.Row([
                     ft.TextButton(
@@ -58,14 +152,14 @@ class RoutesView:
                     ),
                     ft.Text("🗺️ Mis Rutas", size=28, weight=ft.FontWeight.BOLD),
                 ], alignment=ft.MainAxisAlignment.START),
-                ft.Text(f"Usuario: {user.nombre}", size=16, color="grey"),
+                self._user_text,
                 ft.Divider(height=20),
             ], spacing=10),
             padding=ft.padding.only(bottom=20)
         )
         
         # Botón para crear nueva ruta
-        create_button = ft.Container(
+        self._create_button = ft.Container(
             content=ft.ElevatedButton(
                 content=ft.Row([
                     ft.Text("➕", size=20),  # Emoji más
@@ -80,34 +174,42 @@ class RoutesView:
             alignment=ft.alignment.center,
             padding=ft.padding.only(bottom=20)
         )
+    
+    @staticmethod
+    def _routes_fingerprint_of(routes: List[Ruta]) -> tuple:
+        """
+        Calcula una huella ligera de una lista de rutas
         
-        # Actualizar contenido de rutas
-        self._update_routes_content()
-        
-        # Contenido principal
-        return ft.Container(
-            content=ft.Column([
-                header,
-                self.message_container,
-                create_button,
-                self.routes_container,
-            ], 
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=15
-            ),
-            padding=40,
-            border_radius=15,
-            bgcolor="white",
-            shadow=ft.BoxShadow(
-                spread_radius=2,
-                blur_radius=20,
-                color="grey400",
-            ),
-            expand=True
-        )
+        Args:
+            routes: Lista de rutas
+            
+        Returns:
+            Tupla con los datos visibles de cada ruta
+        """
+        # Se guarda la tupla completa (no solo su hash): la comparación con ==
+        # es exacta y una colisión de hash no puede descartar una actualización
+        return tuple((r.id, r.nombre, r.descripcion, r.created_at) for r in routes or [])
     
-    def _update_routes_content(self):
-        """Actualiza el contenido del contenedor de rutas"""
+    def _update_routes_content(self, fingerprint: Optional[tuple] = None):
+        """
+        Actualiza el contenido del contenedor de rutas
+        
+        Args:
+            fingerprint: Huella de self.routes si ya fue calculada
+        """
+        if fingerprint is None:
+            fingerprint = self._routes_fingerprint_of(self.routes)
+        self._routes_fingerprint = fingerprint
+        self._routes_by_id = {ruta.id: ruta for ruta in self.routes}
+        
+        # Descartar las fechas y tarjetas de rutas que ya no están en la lista
+        for route_id in list(self._fecha_cache):
+            if route_id not in self._routes_by_id:
+                del self._fecha_cache[route_id]
+        for route_id in list(self._card_by_id):
+            if route_id not in self._routes_by_id:
+                del self._card_by_id[route_id]
+        
         if not self.routes:
             # Mostrar mensaje cuando no hay rutas
             self.routes_container.content = ft.Container(
@@ -127,20 +229,72 @@ class RoutesView:
                 border=ft.border.all(2, "grey300")
             )
         else:
-            # Mostrar lista de rutas
+            # Mostrar lista de rutas: solo se materializan las tarjetas de la
+            # ventana visible, el resto son espacios reservados reutilizados
+            visible_end = self._visible_count
+            placeholders = self._placeholders
             routes_list = []
-            
             for i, ruta in enumerate(self.routes):
-                route_card = self._create_route_card(ruta, i)
-                routes_list.append(route_card)
+                if i < visible_end:
+                    routes_list.append(self._get_route_card(ruta, i))
+                else:
+                    j = i - visible_end
+                    if j == len(placeholders):
+                        placeholders.append(self._create_route_placeholder())
+                    routes_list.append(placeholders[j])
             
-            self.routes_container.content = ft.Column([
-                ft.Text(f"📋 Total de rutas: {len(self.routes)}", size=16, weight=ft.FontWeight.BOLD),
-                ft.Container(height=10),
-                ft.Column(routes_list, spacing=10)
-            ], 
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=10)
+            self._count_text.value = f"📋 Total de rutas: {len(self.routes)}"
+            self._routes_list_view.controls = routes_list
+            self.routes_container.content = self._routes_list_content
+    
+    def _on_routes_scroll(self, e):
+        """
+        Amplía la ventana de tarjetas materializadas al acercarse al final de la lista
+        
+        Args:
+            e: Evento de scroll del ListView
+        """
+        if self._visible_count >= len(self.routes):
+            return
+        if e.pixels < e.max_scroll_extent - _SCROLL_LOAD_THRESHOLD:
+            return
+        
+        start = self._visible_count
+        self._visible_count = min(start + _ROUTES_PAGE_SIZE, len(self.routes))
+        controls = self._routes_list_view.controls
+        for i in range(start, self._visible_count):
+            controls[i] = self._get_route_card(self.routes[i], i)
+        self._routes_list_view.update()
+    
+    @staticmethod
+    def _create_route_placeholder() -> ft.Container:
+        """Crea un espacio reservado con la altura estimada de una tarjeta"""
+        return ft.Container(height=_ESTIMATED_CARD_HEIGHT)
+    
+    def _get_route_card(self, ruta: Ruta, index: int) -> ft.Container:
+        """
+        Obtiene la tarjeta de una ruta, reutilizando la ya construida
+        
+        Solo se actualizan en su lugar los textos que pueden cambiar (emoji
+        por posición, nombre y descripción); Flet envía únicamente los
+        valores que realmente cambiaron.
+        
+        Args:
+            ruta: Objeto Ruta
+            index: Índice en la lista
+            
+        Returns:
+            Container con la tarjeta de la ruta
+        """
+        entry = self._card_by_id.get(ruta.id)
+        if entry is None:
+            return self._create_route_card(ruta, index)
+        
+        card, emoji_text, nombre_text, descripcion_text = entry
+        emoji_text.value = _ROUTE_EMOJIS[index % len(_ROUTE_EMOJIS)]
+        nombre_text.value = ruta.nombre
+        descripcion_text.value = ruta.descripcion or "Sin descripción"
+        return card
     
     def _create_route_card(self, ruta: Ruta, index: int) -> ft.Container:
         """
@@ -154,36 +308,45 @@ class RoutesView:
             Container con la tarjeta de la ruta
         """
         # Iconos para diferentes índices (usando emojis)
-        emojis = ["🗺️", "📍", "🚩", "🏁", "⭐", "🎯", "📌", "🔵", "🟢", "🟡"]
-        emoji = emojis[index % len(emojis)]
-        
-        # Descripción truncada
-        descripcion_text = ruta.descripcion if ruta.descripcion else "Sin descripción"
-        if len(descripcion_text) > 100:
-            descripcion_text = descripcion_text[:100] + "..."
-        
-        # Fecha de creación
-        fecha_text = "Fecha no disponible"
-        if ruta.created_at:
-            try:
-                fecha_text = ruta.created_at.strftime("%d/%m/%Y %H:%M")
-            except:
-                fecha_text = str(ruta.created_at)
+        emoji = _ROUTE_EMOJIS[index % len(_ROUTE_EMOJIS)]
         
-        return ft.Container(
+        # Fecha de creación (formateada una sola vez por ruta)
+        fecha_text = self._fecha_cache.get(ruta.id)
+        if fecha_text is None:
+            fecha_text = "Fecha no disponible"
+            if ruta.created_at:
+                try:
+                    fecha_text = ruta.created_at.strftime("%d/%m/%Y %H:%M")
+                except:
+                    fecha_text = str(ruta.created_at)
+            self._fecha_cache[ruta.id] = fecha_text
+        
+        # Controles que _get_route_card actualiza en su lugar
+        emoji_control = ft.Text(emoji, size=30)  # Usar emoji en lugar de ícono
+        nombre_control = ft.Text(ruta.nombre, size=18, weight=ft.FontWeight.BOLD)
+        # Descripción (Flet la recorta con puntos suspensivos)
+        descripcion_control = ft.Text(
+            ruta.descripcion or "Sin descripción",
+            size=14,
+            color="grey700",
+            max_lines=2,
+            overflow=ft.TextOverflow.ELLIPSIS
+        )
+        
+        card = ft.Container(
             content=ft.Column([
                 # Encabezado de la tarjeta
                 ft.Row([
-                    ft.Text(emoji, size=30),  # Usar emoji en lugar de ícono
+                    emoji_control,
                     ft.Column([
-                        ft.Text(ruta.nombre, size=18, weight=ft.FontWeight.BOLD),
+                        nombre_control,
                         ft.Text(f"ID: {ruta.id}", size=12, color="grey"),
                     ], spacing=2, expand=True),
                     ft.Text("⋮", size=20, color="grey")  # Menú de tres puntos como emoji
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 
                 # Descripción
-                ft.Text(descripcion_text, size=14, color="grey700"),
+                descripcion_control,
                 
                 # Footer con fecha y acciones
                 ft.Row([
@@ -194,14 +357,16 @@ class RoutesView:
                                 ft.Text("📋", size=14),
                                 ft.Text("Ver paradas", size=12)
                             ], spacing=5),
-                            on_click=lambda e, r=ruta: self._on_view_stops(r)
+                            data=ruta.id,
+                            on_click=self._on_route_view_stops_click
                         ),
                         ft.TextButton(
                             content=ft.Row([
                                 ft.Text("⚙️", size=14),
                                 ft.Text("Gestionar", size=12)
                             ], spacing=5),
-                            on_click=lambda e, r=ruta: self._on_manage_route(r)
+                            data=ruta.id,
+                            on_click=self._on_route_manage_click
                         ),
                     ], spacing=10)
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
@@ -217,6 +382,20 @@ class RoutesView:
             ),
             width=600
         )
+        self._card_by_id[ruta.id] = (card, emoji_control, nombre_control, descripcion_control)
+        return card
+    
+    def _on_route_view_stops_click(self, e):
+        """Muestra las paradas de la ruta cuyo ID guarda el botón pulsado"""
+        ruta = self._routes_by_id.get(e.control.data)
+        if ruta is not None:
+            self._on_view_stops(ruta)
+    
+    def _on_route_manage_click(self, e):
+        """Gestiona la ruta cuyo ID guarda el botón pulsado"""
+        ruta = self._routes_by_id.get(e.control.data)
+        if ruta is not None:
+            self._on_manage_route(ruta)
     
     def _on_back_click(self, e):
         """Maneja el click del botón volver"""
@@ -313,8 +492,13 @@ class RoutesView:
         Args:
             routes: Nueva lista de rutas
         """
+        # Evitar re-renderizar si la lista es idéntica a la última mostrada
+        fingerprint = self._routes_fingerprint_of(routes)
+        if fingerprint == self._routes_fingerprint:
+            return
+        
         self.routes = routes
-        self._update_routes_content()
+        self._update_routes_content(fingerprint)
         if hasattr(self, '_page_ref'):
             self._page_ref.update()
     
@@ -326,31 +510,7 @@ class RoutesView:
             message: Mensaje a mostrar
             message_type: Tipo de mensaje (info, success, warning, error)
         """
-        color_map = {
-            "info": "blue",
-            "success": "green", 
-            "warning": "orange",
-            "error": "red"
-        }
-        
-        bgcolor_map = {
-            "info": "lightblue100",
-            "success": "lightgreen100", 
-            "warning": "lightyellow100",
-            "error": "lightred100"
-        }
-        
-        color = color_map.get(message_type, "blue")
-        bgcolor = bgcolor_map.get(message_type, "lightblue100")
-        
-        icon_map = {
-            "info": "ℹ️",
-            "success": "",
-            "warning": "⚠️",
-            "error": "❌"
-        }
-        
-        emoji = icon_map.get(message_type, "ℹ️")
+        color, bgcolor, emoji = _STYLE_BY_TYPE.get(message_type, _STYLE_BY_TYPE["info"])
         
         self.message_container.content = ft.Container(
             content=ft.Row([
@@ -0,0 +1,26 @@
+"""
+Utilidades compartidas por las vistas
+"""
+from typing import Optional
+import flet as ft
+
+
+def mounted_page(container: Optional[ft.Control]) -> Optional[ft.Page]:
+    """
+    Obtiene la página solo si el contenedor de una vista sigue mostrado en ella
+    
+    La navegación de la app usa page.clean() + page.add(), que no limpia
+    control.page de los controles retirados; por eso se comprueba que el
+    contenedor siga entre los controles de la página. Evita enviar cambios
+    de una vista desmontada en actualizaciones diferidas.
+    
+    Args:
+        container: Contenedor raíz de la vista (puede ser None si no se ha creado)
+    
+    Returns:
+        Página que muestra la vista, o None si no está montada
+    """
+    page = container.page if container is not None else None
+    if page is None or container not in page.controls:
+        return None
+    return page